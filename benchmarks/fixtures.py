@@ -0,0 +1,114 @@
+"""Synthetic, deterministic inputs for the benchmark suite."""
+
+from __future__ import annotations
+
+import random
+
+from lowest_price_buyer.models import Offer
+
+
+def amazon_html(cards: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts = ["<html><body><div class='s-main-slot'>"]
+    for index in range(cards):
+        price = rng.randint(500, 80000)
+        points = price // 100 if index % 3 else 0
+        parts.append(
+            "<div class='s-result-item' data-component-type='s-search-result' "
+            f"data-asin='B{index:09d}'>"
+            "<div class='s-card'><span class='a-badge'>Best seller</span>"
+            f"<h2><a href='/dp/B{index:09d}/ref=sr_1_{index}'>"
+            f"<span>Sample product {index} model HAC-{index:03d}</span></a></h2>"
+            "<div class='a-row'><span class='a-icon-alt'>5つ星のうち4.5</span></div>"
+            f"<span class='a-price'><span class='a-offscreen'>￥{price:,}</span>"
+            f"<span aria-hidden='true'>￥{price:,}</span></span>"
+            + (f"<span>{points:,}ポイント(1%)</span>" if points else "")
+            + "<div class='a-row'>配送料無料 明日 お届け</div>"
+            "</div></div>"
+        )
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+
+def yodobashi_html(cards: int, links_per_card: int = 3, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts = ["<html><body><div id='list'>"]
+    for index in range(cards):
+        href = f"/product/{100000000000 + index}/"
+        price = rng.randint(500, 80000)
+        links = "".join(
+            f"<a href='{href}'>Product {index} {'link ' * i}</a>"
+            for i in range(links_per_card)
+        )
+        parts.append(
+            "<div class='productListTile'>"
+            f"{links}<span>{price:,}円</span>"
+            f"<span>{price // 10:,}ポイント（10%還元）</span>"
+            "</div>"
+        )
+    parts.append("</div></body></html>")
+    return "".join(parts)
+
+
+def yahoo_payload(hits: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    return {
+        "totalResultsAvailable": hits,
+        "hits": [
+            {
+                "name": f"Yahoo product {index}",
+                "price": rng.randint(500, 80000),
+                "url": f"https://store.shopping.yahoo.co.jp/item/{index}",
+                "shipping": {"fee": rng.choice([0, 0, 550])},
+                "point": {"amount": rng.randint(0, 800), "times": 1},
+            }
+            for index in range(hits)
+        ],
+    }
+
+
+def rakuten_payload(hits: int, seed: int = 0) -> dict:
+    rng = random.Random(seed)
+    return {
+        "count": hits,
+        "Items": [
+            {
+                "Item": {
+                    "itemName": f"Rakuten product {index}",
+                    "itemPrice": rng.randint(500, 80000),
+                    "pointRate": rng.choice([1, 2, 5, 10]),
+                    "itemUrl": f"https://item.rakuten.co.jp/shop/{index}/",
+                }
+            }
+            for index in range(hits)
+        ],
+    }
+
+
+def offers(count: int, seed: int = 0) -> list[Offer]:
+    rng = random.Random(seed)
+    providers = ["yahoo", "rakuten", "amazon", "yodobashi", "manual"]
+    result = []
+    for index in range(count):
+        price = rng.randint(500, 80000)
+        if index % 2:
+            result.append(
+                Offer(
+                    provider=rng.choice(providers),
+                    title=f"Offer {index}",
+                    price_yen=price,
+                    shipping_yen=rng.choice([0, 0, 550]),
+                    point_rate=rng.choice([None, 1.0, 5.0, 10.0]),
+                    url=f"https://example.com/{index}",
+                )
+            )
+        else:
+            result.append(
+                Offer(
+                    provider=rng.choice(providers),
+                    title=f"Offer {index}",
+                    price_yen=price,
+                    point_amount_yen=rng.randint(0, price // 10),
+                )
+            )
+    return result
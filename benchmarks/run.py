@@ -0,0 +1,232 @@
+"""Benchmark suite for parsers, point calculation and ranking.
+
+Run from the repository root::
+
+    python -m benchmarks.run                    # compare with benchmarks/baseline.json
+    python -m benchmarks.run --update-baseline  # record a new baseline
+    python -m benchmarks.run --quick --only parse_amazon_html
+
+Each case is timed at several input sizes (best of ``--repeat`` runs) and its
+peak traced memory is measured in a separate run. The command exits with
+status 1 when a case is slower or uses more memory than the baseline allows.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import platform
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+from benchmarks import fixtures
+from lowest_price_buyer.columnar import OfferBatch
+from lowest_price_buyer.comparator import evaluate_offers
+from lowest_price_buyer.points import calculate_points
+from lowest_price_buyer.providers.amazon import parse_amazon_html
+from lowest_price_buyer.providers.rakuten import parse_rakuten_response
+from lowest_price_buyer.providers.soup import get_backend
+from lowest_price_buyer.providers.yahoo import parse_yahoo_response
+from lowest_price_buyer.providers.yodobashi import parse_yodobashi_html
+
+
+BASELINE_PATH = Path(__file__).with_name("baseline.json")
+# Small absolute slack so sub-millisecond cases and tiny allocations do not
+# trip the relative checks on timer or allocator noise.
+TIME_SLACK_MS = 2.0
+MEMORY_SLACK_KIB = 64.0
+
+
+@dataclass
+class Case:
+    name: str
+    sizes: tuple[int, ...]
+    quick_sizes: tuple[int, ...]
+    setup: Callable[[int], Any]
+    run: Callable[[Any, int], Any]
+
+
+def _points(offers: list) -> None:
+    for offer in offers:
+        calculate_points(offer)
+
+
+CASES = [
+    Case(
+        "parse_amazon_html",
+        (50, 200, 500),
+        (50,),
+        fixtures.amazon_html,
+        lambda html, size: parse_amazon_html(html, max_results=size),
+    ),
+    Case(
+        "parse_yodobashi_html",
+        (50, 200, 500),
+        (50,),
+        fixtures.yodobashi_html,
+        lambda html, size: parse_yodobashi_html(html, max_results=size),
+    ),
+    Case(
+        "parse_yahoo_response",
+        (100, 1000, 5000),
+        (100,),
+        fixtures.yahoo_payload,
+        lambda payload, size: parse_yahoo_response(payload, max_results=size),
+    ),
+    Case(
+        "parse_rakuten_response",
+        (100, 1000, 5000),
+        (100,),
+        fixtures.rakuten_payload,
+        lambda payload, size: parse_rakuten_response(payload, max_results=size),
+    ),
+    Case(
+        "calculate_points",
+        (1000, 10000, 100000),
+        (1000,),
+        fixtures.offers,
+        lambda offers, size: _points(offers),
+    ),
+    Case(
+        "evaluate_offers",
+        (1000, 10000, 100000),
+        (1000,),
+        fixtures.offers,
+        lambda offers, size: evaluate_offers(offers),
+    ),
+    Case(
+        "evaluate_offers_top10",
+        (1000, 10000, 100000),
+        (1000,),
+        fixtures.offers,
+        lambda offers, size: evaluate_offers(offers, limit=10),
+    ),
+    Case(
+        "offer_batch_evaluate",
+        (1000, 10000, 100000),
+        (1000,),
+        lambda size: OfferBatch.from_offers(fixtures.offers(size)),
+        lambda batch, size: batch.evaluate(),
+    ),
+]
+
+
+def measure(case: Case, size: int, repeat: int) -> dict[str, float]:
+    data = case.setup(size)
+    case.run(data, size)  # warm-up
+
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        case.run(data, size)
+        timings.append(time.perf_counter() - started)
+    best = min(timings)
+
+    tracemalloc.start()
+    try:
+        case.run(data, size)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "best_ms": round(best * 1000, 3),
+        "items_per_s": round(size / best, 1) if best else 0.0,
+        "peak_kib": round(peak / 1024, 1),
+    }
+
+
+def compare(
+    results: dict[str, dict[str, float]],
+    baseline: dict[str, dict[str, float]],
+    time_tolerance: float,
+    memory_tolerance: float,
+) -> list[str]:
+    regressions = []
+    for key, result in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        allowed_ms = reference["best_ms"] * (1 + time_tolerance) + TIME_SLACK_MS
+        if result["best_ms"] > allowed_ms:
+            regressions.append(
+                f"{key}: {result['best_ms']}ms vs baseline {reference['best_ms']}ms"
+            )
+        allowed_kib = reference["peak_kib"] * (1 + memory_tolerance) + MEMORY_SLACK_KIB
+        if result["peak_kib"] > allowed_kib:
+            regressions.append(
+                f"{key}: peak {result['peak_kib']}KiB vs baseline {reference['peak_kib']}KiB"
+            )
+    return regressions
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Run the benchmark suite")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--quick", action="store_true", help="Only the smallest size")
+    parser.add_argument("--only", action="append", help="Run only the named case(s)")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH)
+    parser.add_argument("--update-baseline", action="store_true")
+    parser.add_argument(
+        "--time-tolerance",
+        type=float,
+        default=1.0,
+        help="Allowed slowdown vs baseline as a fraction (default: 1.0)",
+    )
+    parser.add_argument(
+        "--memory-tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed peak memory growth vs baseline as a fraction (default: 0.2)",
+    )
+    parser.add_argument("--as-json", action="store_true")
+    args = parser.parse_args(argv)
+
+    results: dict[str, dict[str, float]] = {}
+    for case in CASES:
+        if args.only and case.name not in args.only:
+            continue
+        for size in case.quick_sizes if args.quick else case.sizes:
+            key = f"{case.name}[{size}]"
+            results[key] = measure(case, size, args.repeat)
+            if not args.as_json:
+                result = results[key]
+                print(
+                    f"{key:32} {result['best_ms']:>10.3f} ms "
+                    f"{result['items_per_s']:>12.1f} items/s "
+                    f"{result['peak_kib']:>10.1f} KiB peak"
+                )
+
+    if args.as_json:
+        print(json.dumps(results, indent=2))
+
+    if args.update_baseline:
+        merged = {}
+        if args.baseline.exists():
+            merged = json.loads(args.baseline.read_text(encoding="utf-8")).get("results", {})
+        merged.update(results)
+        document = {
+            "python": platform.python_version(),
+            "html_parser": get_backend(),
+            "results": merged,
+        }
+        args.baseline.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    if not args.baseline.exists():
+        print(f"no baseline at {args.baseline}; run with --update-baseline")
+        return 0
+
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8")).get("results", {})
+    regressions = compare(results, baseline, args.time_tolerance, args.memory_tolerance)
+    for regression in regressions:
+        print(f"[regression] {regression}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
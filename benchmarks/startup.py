@@ -0,0 +1,118 @@
+"""Startup-time budget for the CLI.
+
+Run from the repository root::
+
+    python -m benchmarks.startup
+    python -m benchmarks.startup --budget-ms 80
+
+Two commands are measured in fresh interpreters with ``-X importtime``:
+``lowest-price-buyer --help`` and a Yahoo search answered from a warm response
+cache. The reported time is the cumulative import time of everything the
+command imported besides the interpreter's own ``site`` setup (best of
+``--repeat`` runs). The command exits with status 1 when a case goes over the
+budget or imports a heavy dependency it should not need.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import re
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+from benchmarks import fixtures
+from lowest_price_buyer.cache import ResponseCache
+
+
+DEFAULT_BUDGET_MS = 100.0
+# Neither case talks to the network or parses HTML.
+FORBIDDEN = ("requests", "urllib3", "bs4", "soupsieve", "lxml", "numpy")
+KEYWORD = "Nintendo Switch"
+
+_IMPORT_LINE = re.compile(r"^import time:\s+\d+ \|\s+(\d+) \| (\s*)(\S+)")
+# Runs the CLI, then reports which forbidden modules ended up imported.
+_RUNNER = """
+import json, sys
+from lowest_price_buyer.cli import main
+try:
+    main(sys.argv[1:])
+except SystemExit:
+    pass
+heavy = sorted({name.split(".")[0] for name in sys.modules} & set(%r))
+print("heavy:" + json.dumps(heavy), file=sys.stderr)
+"""
+
+
+def measure(argv: list[str]) -> tuple[float, list[str]]:
+    """Import time in ms and the forbidden modules imported by one CLI run."""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _RUNNER % (FORBIDDEN,), *argv],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total_us = 0
+    heavy: list[str] = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match is None:
+            if line.startswith("heavy:"):
+                heavy = json.loads(line[len("heavy:") :])
+            continue
+        cumulative, indent, name = match.groups()
+        # Only top-level entries; nested ones are already in their parent's total.
+        if not indent and name not in ("site", "encodings"):
+            total_us += int(cumulative)
+    return total_us / 1000, heavy
+
+
+def cases(cache_dir: Path) -> dict[str, list[str]]:
+    ResponseCache(cache_dir).put("yahoo", KEYWORD, 5, fixtures.yahoo_payload(20))
+    return {
+        "help": ["--help"],
+        "cache_hit": [
+            KEYWORD,
+            "--providers",
+            "yahoo",
+            "--yahoo-app-id",
+            "benchmark",
+            "--cache-dir",
+            str(cache_dir),
+            "--as-json",
+        ],
+    }
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Check CLI startup against an import budget")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--budget-ms",
+        type=float,
+        default=DEFAULT_BUDGET_MS,
+        help=f"Allowed import time per command (default: {DEFAULT_BUDGET_MS:g})",
+    )
+    args = parser.parse_args(argv)
+
+    failures = []
+    with tempfile.TemporaryDirectory() as cache_dir:
+        for name, cli_args in cases(Path(cache_dir)).items():
+            runs = [measure(cli_args) for _ in range(args.repeat)]
+            best_ms = min(ms for ms, _ in runs)
+            heavy = runs[0][1]
+            print(f"{name:12} {best_ms:>8.1f} ms imports  heavy={','.join(heavy) or '-'}")
+            if best_ms > args.budget_ms:
+                failures.append(f"{name}: {best_ms:.1f} ms > {args.budget_ms:g} ms budget")
+            if heavy:
+                failures.append(f"{name}: imported {', '.join(heavy)}")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,6 +1,34 @@
 """Lowest price buyer package."""
 
-from .models import Offer, EvaluatedOffer
-from .comparator import evaluate_offers
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .comparator import evaluate_offers
+    from .models import EvaluatedOffer, Offer
 
 __all__ = ["Offer", "EvaluatedOffer", "evaluate_offers"]
+
+# Resolved on first attribute access (PEP 562) so importing a submodule such as
+# the CLI does not pull in the rest of the package.
+_LAZY = {
+    "Offer": "models",
+    "EvaluatedOffer": "models",
+    "evaluate_offers": "comparator",
+}
+
+
+def __getattr__(name: str) -> Any:
+    module = _LAZY.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+
+    value = getattr(import_module(f".{module}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted([*globals(), *__all__])
@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Callable, Iterable, Iterator, TextIO, TypeVar
+
+
+T = TypeVar("T")
+
+
+def iter_keywords(stream: TextIO) -> Iterator[str]:
+    """Yield one keyword per non-empty line, skipping ``#`` comments."""
+    for line in stream:
+        keyword = line.strip()
+        if keyword and not keyword.startswith("#"):
+            yield keyword
+
+
+def run_batch(
+    keywords: Iterable[str],
+    search: Callable[[str], T],
+    concurrency: int = 4,
+) -> Iterator[tuple[str, T]]:
+    """Run ``search`` for every keyword and yield results as they finish.
+
+    At most ``concurrency`` keywords are in flight and the keyword iterable is
+    consumed lazily, so memory does not grow with the length of the input.
+    Results are yielded in completion order, not input order.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+
+    source = iter(keywords)
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="keyword") as pool:
+        in_flight: dict[Future, str] = {}
+        exhausted = False
+        while True:
+            while not exhausted and len(in_flight) < concurrency:
+                try:
+                    keyword = next(source)
+                except StopIteration:
+                    exhausted = True
+                    break
+                in_flight[pool.submit(search, keyword)] = keyword
+
+            if not in_flight:
+                return
+
+            done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+            for future in done:
+                keyword = in_flight.pop(future)
+                yield keyword, future.result()
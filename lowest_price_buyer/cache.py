@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+
+DEFAULT_TTL = 600.0
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    expired: int = 0
+    stores: int = 0
+    evictions: int = 0
+
+    def as_dict(self) -> dict[str, int]:
+        return asdict(self)
+
+
+class ResponseCache:
+    """Raw provider payloads stored gzip-compressed on disk.
+
+    Entries are keyed by provider, keyword and max_results. Each provider can
+    have its own TTL; once the directory grows past ``max_bytes`` the least
+    recently used entries are removed. File modification times double as the
+    LRU clock so the ordering survives restarts.
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        default_ttl: float = DEFAULT_TTL,
+        ttl: dict[str, float] | None = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        self.directory = Path(directory)
+        self.default_ttl = default_ttl
+        self.ttl = dict(ttl or {})
+        self.max_bytes = max_bytes
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._entries: dict[Path, tuple[int, float]] = {}
+        self._total_bytes = 0
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._scan()
+
+    def get(self, provider: str, keyword: str, max_results: int) -> Any | None:
+        path = self._path(provider, keyword, max_results)
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as handle:
+                entry = json.load(handle)
+        except (OSError, ValueError):
+            with self._lock:
+                self.stats.misses += 1
+            return None
+
+        if time.time() - entry["stored_at"] > self.ttl_for(provider):
+            self._remove(path)
+            with self._lock:
+                self.stats.expired += 1
+                self.stats.misses += 1
+            return None
+
+        now = time.time()
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        with self._lock:
+            self.stats.hits += 1
+            if path in self._entries:
+                self._entries[path] = (self._entries[path][0], now)
+        return entry["raw"]
+
+    def put(self, provider: str, keyword: str, max_results: int, raw: Any) -> None:
+        path = self._path(provider, keyword, max_results)
+        entry = {
+            "provider": provider,
+            "keyword": keyword,
+            "max_results": max_results,
+            "stored_at": time.time(),
+            "raw": raw,
+        }
+        data = gzip.compress(json.dumps(entry, ensure_ascii=False).encode("utf-8"))
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        tmp.write_bytes(data)
+        os.replace(tmp, path)
+
+        with self._lock:
+            previous = self._entries.get(path)
+            if previous is not None:
+                self._total_bytes -= previous[0]
+            self._entries[path] = (len(data), time.time())
+            self._total_bytes += len(data)
+            self.stats.stores += 1
+            self._evict()
+
+    def ttl_for(self, provider: str) -> float:
+        return self.ttl.get(provider, self.default_ttl)
+
+    @property
+    def total_bytes(self) -> int:
+        return self._total_bytes
+
+    def _path(self, provider: str, keyword: str, max_results: int) -> Path:
+        key = json.dumps([provider, keyword, max_results], ensure_ascii=False)
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.directory / provider / f"{digest}.json.gz"
+
+    def _scan(self) -> None:
+        for path in self.directory.glob("*/*.json.gz"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            self._entries[path] = (stat.st_size, stat.st_mtime)
+            self._total_bytes += stat.st_size
+
+    def _evict(self) -> None:
+        if self._total_bytes <= self.max_bytes:
+            return
+        for path, (size, _) in sorted(self._entries.items(), key=lambda item: item[1][1]):
+            if self._total_bytes <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+            except FileNotFoundError:
+                pass
+            del self._entries[path]
+            self._total_bytes -= size
+            self.stats.evictions += 1
+
+    def _remove(self, path: Path) -> None:
+        try:
+            path.unlink()
+        except FileNotFoundError:
+            pass
+        with self._lock:
+            entry = self._entries.pop(path, None)
+            if entry is not None:
+                self._total_bytes -= entry[0]
+
+
+def parse_ttl_spec(spec: str) -> tuple[float, dict[str, float]]:
+    """Parse ``"600,amazon=300"`` into a default TTL and per-provider TTLs."""
+    default_ttl = DEFAULT_TTL
+    per_provider: dict[str, float] = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "=" in part:
+            provider, _, seconds = part.partition("=")
+            per_provider[provider.strip().lower()] = float(seconds)
+        else:
+            default_ttl = float(part)
+    return default_ttl, per_provider
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import datetime as dt
+import json
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from .models import Offer
+
+_RULE_KEYS = frozenset(
+    {"name", "provider", "store", "rate", "bonus_yen", "cap_yen", "min_gross_yen", "days", "start", "end"}
+)
+# Compiled rule: (rate / 100, bonus_yen, cap_yen or None, min_gross_yen)
+_Compiled = tuple[float, int, "int | None", int]
+
+
+@dataclass(frozen=True)
+class CampaignRule:
+    """Extra points one campaign grants on top of an offer's own points.
+
+    ``rate`` is a percentage of the gross price like ``Offer.point_rate`` and
+    ``bonus_yen`` a flat amount; ``cap_yen`` limits what the rule grants per
+    offer. ``store`` narrows the rule to one shop of the provider, ``days``
+    to days of the month and ``start``/``end`` to a date range (inclusive).
+    """
+
+    name: str
+    provider: str
+    store: str | None = None
+    rate: float = 0.0
+    bonus_yen: int = 0
+    cap_yen: int | None = None
+    min_gross_yen: int = 0
+    days: frozenset[int] | None = None
+    start: dt.date | None = None
+    end: dt.date | None = None
+
+    def active_on(self, day: dt.date) -> bool:
+        if self.start is not None and day < self.start:
+            return False
+        if self.end is not None and day > self.end:
+            return False
+        return self.days is None or day.day in self.days
+
+    @classmethod
+    def from_dict(cls, data: dict) -> CampaignRule:
+        unknown = set(data) - _RULE_KEYS
+        if unknown:
+            raise ValueError(f"unknown campaign rule keys: {', '.join(sorted(unknown))}")
+        rule = cls(
+            name=str(data.get("name") or data["provider"]),
+            provider=str(data["provider"]),
+            store=str(data["store"]) if data.get("store") is not None else None,
+            rate=float(data.get("rate", 0) or 0),
+            bonus_yen=int(data.get("bonus_yen", 0) or 0),
+            cap_yen=int(data["cap_yen"]) if data.get("cap_yen") is not None else None,
+            min_gross_yen=int(data.get("min_gross_yen", 0) or 0),
+            days=frozenset(int(day) for day in data["days"]) if data.get("days") else None,
+            start=dt.date.fromisoformat(data["start"]) if data.get("start") else None,
+            end=dt.date.fromisoformat(data["end"]) if data.get("end") else None,
+        )
+        if rule.rate < 0 or rule.bonus_yen < 0 or (rule.cap_yen is not None and rule.cap_yen < 0):
+            raise ValueError(f"campaign rule {rule.name!r} must not grant negative points")
+        return rule
+
+
+class CampaignBook:
+    """Campaign rules compiled into lookup tables for bulk evaluation.
+
+    The rules active on a day are compiled once into one table keyed by
+    provider and one keyed by (provider, store), where each store entry
+    already includes the provider-wide rules. Evaluating an offer is then a
+    single dict lookup plus its matching rules, however many rules the book
+    holds. Matching rules stack, each limited by its own cap. Tables are
+    recompiled when the date changes, so long-running watch and server
+    processes follow campaign days.
+    """
+
+    def __init__(self, rules: Iterable[CampaignRule]):
+        self.rules = list(rules)
+        self._compiled: tuple[dt.date, dict, dict] | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.rules)
+
+    def bonus_points(self, offers: Sequence[Offer], today: dt.date | None = None) -> list[int]:
+        """Campaign points for each offer, in order."""
+        return self.bonus_column(
+            ((offer.provider, offer.store) for offer in offers),
+            (max(offer.price_yen + offer.shipping_yen, 0) for offer in offers),
+            today,
+        )
+
+    def bonus_column(
+        self,
+        keys: Iterable[tuple[str, str | None]],
+        gross_yen: Iterable[int],
+        today: dt.date | None = None,
+    ) -> list[int]:
+        """Campaign points for parallel (provider, store) and gross-price columns."""
+        by_provider, by_store = self._tables(today or dt.date.today())
+        bonuses = []
+        append = bonuses.append
+        for key, gross in zip(keys, gross_yen):
+            rules = by_store.get(key) or by_provider.get(key[0])
+            if not rules:
+                append(0)
+                continue
+            total = 0
+            for rate, bonus, cap, minimum in rules:
+                if gross < minimum:
+                    continue
+                # Same float operations as calculate_points.
+                points = int(gross * rate) + bonus
+                total += points if cap is None or points < cap else cap
+            append(total)
+        return bonuses
+
+    def _tables(self, day: dt.date) -> tuple[dict, dict]:
+        with self._lock:
+            if self._compiled is None or self._compiled[0] != day:
+                self._compiled = (day, *_compile(rule for rule in self.rules if rule.active_on(day)))
+            return self._compiled[1], self._compiled[2]
+
+
+def _compile(rules: Iterable[CampaignRule]) -> tuple[dict, dict]:
+    by_provider: dict[str, list[_Compiled]] = {}
+    by_store: dict[tuple[str, str], list[_Compiled]] = {}
+    for rule in rules:
+        compiled = (rule.rate / 100.0, rule.bonus_yen, rule.cap_yen, rule.min_gross_yen)
+        if rule.store is None:
+            by_provider.setdefault(rule.provider, []).append(compiled)
+        else:
+            by_store.setdefault((rule.provider, rule.store), []).append(compiled)
+    store_table = {
+        key: tuple(by_provider.get(key[0], ())) + tuple(rules)
+        for key, rules in by_store.items()
+    }
+    return {provider: tuple(rules) for provider, rules in by_provider.items()}, store_table
+
+
+def load_campaigns(path: Path | str) -> CampaignBook:
+    """Load a JSON rule file: a list of rules or ``{"rules": [...]}``."""
+    with Path(path).open("r", encoding="utf-8") as stream:
+        data = json.load(stream)
+    if isinstance(data, dict):
+        data = data.get("rules", [])
+    if not isinstance(data, list):
+        raise ValueError("campaign file must contain a list of rules")
+    return CampaignBook(CampaignRule.from_dict(item) for item in data)
@@ -0,0 +1,281 @@
+from __future__ import annotations
+
+import json
+import mmap
+import os
+import struct
+from array import array
+from pathlib import Path
+from typing import IO, Iterator
+
+from .matching import normalize_title, title_words
+from .models import Offer
+
+
+MAGIC = b"LPBCAT2\n"
+# count, offsets position, postings position, keys position
+_HEADER = struct.Struct("<QQQQ")
+# Sorted key table: UTF-8 gram padded with NULs, postings start, postings length.
+_KEY = struct.Struct("<8sQQ")
+CHUNK_SIZE = 64 * 1024
+MAX_CANDIDATES = 256
+
+_decoder = json.JSONDecoder()
+
+
+def iter_offer_dicts(stream: IO[str], chunk_size: int = CHUNK_SIZE) -> Iterator[dict]:
+    """Yield offer dicts from a JSON array or NDJSON text stream.
+
+    A JSON array is decoded one element at a time with ``raw_decode`` over a
+    sliding buffer, so memory stays proportional to one offer rather than the
+    whole file. Anything else is read as one JSON object per line. Non-object
+    items are skipped, like the old list loader did.
+    """
+    buffer = stream.read(chunk_size)
+    start = len(buffer) - len(buffer.lstrip())
+    if buffer[start:start + 1] != "[":
+        yield from _iter_lines(buffer, stream, chunk_size)
+        return
+
+    position = start + 1
+    eof = False
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n,":
+            position += 1
+        if position == len(buffer):
+            if eof:
+                raise ValueError("manual offers: unterminated JSON array")
+            buffer, position, eof = _refill(buffer, position, stream, chunk_size)
+            continue
+        if buffer[position] == "]":
+            return
+        try:
+            item, end = _decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            buffer, position, eof = _refill(buffer, position, stream, chunk_size)
+            continue
+        position = end
+        if isinstance(item, dict):
+            yield item
+
+
+def _refill(buffer: str, position: int, stream: IO[str], chunk_size: int) -> tuple[str, int, bool]:
+    chunk = stream.read(chunk_size)
+    return buffer[position:] + chunk, 0, not chunk
+
+
+def _iter_lines(head: str, stream: IO[str], chunk_size: int) -> Iterator[dict]:
+    pending = head
+    while True:
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            if line.strip():
+                item = json.loads(line)
+                if isinstance(item, dict):
+                    yield item
+        chunk = stream.read(chunk_size)
+        if not chunk:
+            break
+        pending += chunk
+    if pending.strip():
+        item = json.loads(pending)
+        if isinstance(item, dict):
+            yield item
+
+
+def iter_offers(path: Path | str) -> Iterator[Offer]:
+    with open(path, encoding="utf-8") as stream:
+        for item in iter_offer_dicts(stream):
+            yield Offer.from_dict(item)
+
+
+def is_catalog(path: Path | str) -> bool:
+    # Any version, so that an outdated catalog gets a clear error from Catalog.
+    with open(path, "rb") as stream:
+        return stream.read(len(MAGIC))[:6] == MAGIC[:6]
+
+
+def _compact(title: str) -> str:
+    return "".join(title_words(normalize_title(title)))
+
+
+def _bigrams(text: str) -> set[str]:
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i : i + 2] for i in range(len(text) - 1)}
+
+
+def compile_catalog(source: Path | str, target: Path | str) -> int:
+    """Compile a JSON/NDJSON offer file into a memory-mappable catalog.
+
+    The catalog stores one compact JSON record per offer, a table of record
+    offsets and an inverted index from title bigram to offer ids. Returns the
+    number of offers written. The file is written next to ``target`` and
+    renamed into place.
+    """
+    target = Path(target)
+    temporary = target.with_name(target.name + ".tmp")
+    postings: dict[str, array] = {}
+    offsets = array("Q")
+    with open(temporary, "wb") as out:
+        out.write(MAGIC)
+        out.write(_HEADER.pack(0, 0, 0, 0))
+        for offer_id, offer in enumerate(iter_offers(source)):
+            offsets.append(out.tell())
+            out.write(json.dumps(_to_dict(offer), ensure_ascii=False).encode("utf-8"))
+            out.write(b"\n")
+            for gram in _bigrams(_compact(offer.title)):
+                postings.setdefault(gram, array("I")).append(offer_id)
+        count = len(offsets)
+        offsets.append(out.tell())
+
+        offsets_position = _align(out)
+        out.write(_little_endian(offsets))
+        postings_position = _align(out)
+        keys = []
+        written = 0
+        for gram, ids in postings.items():
+            keys.append((_key_bytes(gram), written, len(ids)))
+            out.write(_little_endian(ids))
+            written += len(ids)
+        keys_position = _align(out)
+        keys.sort()
+        for key in keys:
+            out.write(_KEY.pack(*key))
+
+        out.seek(len(MAGIC))
+        out.write(_HEADER.pack(count, offsets_position, postings_position, keys_position))
+    os.replace(temporary, target)
+    return count
+
+
+def _key_bytes(gram: str) -> bytes:
+    # Two characters take at most 8 bytes of UTF-8.
+    return gram.encode("utf-8").ljust(_KEY.size - 16, b"\0")
+
+
+def _align(out: IO[bytes], boundary: int = 8) -> int:
+    padding = -out.tell() % boundary
+    out.write(b"\0" * padding)
+    return out.tell()
+
+
+def _little_endian(values: array) -> bytes:
+    if struct.pack("=H", 1) != struct.pack("<H", 1):
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def _to_dict(offer: Offer) -> dict:
+    return {
+        "provider": offer.provider,
+        "title": offer.title,
+        "price_yen": offer.price_yen,
+        "shipping_yen": offer.shipping_yen,
+        "point_rate": offer.point_rate,
+        "point_amount_yen": offer.point_amount_yen,
+        "url": offer.url,
+        "store": offer.store,
+    }
+
+
+class Catalog:
+    """Read-only view of a compiled catalog backed by ``mmap``.
+
+    Nothing is decoded up front. ``lookup`` binary-searches the sorted key
+    table for the keyword bigrams, then reads the postings of the rarest ones
+    and the candidate records, so a search touches the part of the file that
+    is relevant to its keyword.
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = str(path)
+        with open(self.path, "rb") as stream:
+            self._map = mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ)
+        if self._map[: len(MAGIC)] != MAGIC:
+            self._map.close()
+            raise ValueError(
+                f"not a compiled offer catalog of this version: {self.path} "
+                "(rebuild it with 'lowest-price-buyer catalog')"
+            )
+        self.count, self._offsets, self._postings, self._keys = _HEADER.unpack_from(
+            self._map, len(MAGIC)
+        )
+        self._key_count = (len(self._map) - self._keys) // _KEY.size
+
+    def __len__(self) -> int:
+        return self.count
+
+    def lookup(self, keyword: str) -> list[Offer]:
+        """Offers whose normalized title contains every word of ``keyword``."""
+        words = title_words(normalize_title(keyword))
+        if not words:
+            return []
+        # Single characters are not index keys; the substring check applies them.
+        grams = {gram for word in words if len(word) >= 2 for gram in _bigrams(word)}
+        entries = []
+        for gram in grams:
+            entry = self._find_key(gram)
+            if entry is None:
+                return []
+            entries.append(entry)
+        entries.sort(key=lambda entry: entry[1])
+
+        # Intersect from the rarest gram until few candidates remain; reading
+        # postings is much cheaper than decoding records. The substring check
+        # below is exact either way.
+        if entries:
+            candidates = set(self._read_postings(entries[0]))
+        else:
+            candidates = set(range(self.count))
+        for entry in entries[1:]:
+            if len(candidates) <= MAX_CANDIDATES:
+                break
+            candidates.intersection_update(self._read_postings(entry))
+
+        offers = []
+        for offer_id in sorted(candidates):
+            offer = self._read_offer(offer_id)
+            title = _compact(offer.title)
+            if all(word in title for word in words):
+                offers.append(offer)
+        return offers
+
+    def close(self) -> None:
+        self._map.close()
+
+    def __enter__(self) -> Catalog:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _find_key(self, gram: str) -> tuple[int, int] | None:
+        key = _key_bytes(gram)
+        low, high = 0, self._key_count
+        while low < high:
+            middle = (low + high) // 2
+            found, start, length = _KEY.unpack_from(self._map, self._keys + middle * _KEY.size)
+            if found == key:
+                return start, length
+            if found < key:
+                low = middle + 1
+            else:
+                high = middle
+        return None
+
+    def _read_postings(self, entry: tuple[int, int]) -> array:
+        start, length = entry
+        position = self._postings + start * 4
+        ids = array("I")
+        ids.frombytes(self._map[position : position + length * 4])
+        if struct.pack("=H", 1) != struct.pack("<H", 1):
+            ids.byteswap()
+        return ids
+
+    def _read_offer(self, offer_id: int) -> Offer:
+        start, end = struct.unpack_from("<QQ", self._map, self._offsets + offer_id * 8)
+        return Offer.from_dict(json.loads(self._map[start:end]))
@@ -1,44 +1,308 @@
 from __future__ import annotations
 
 import argparse
+import contextlib
 import json
 import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
 
-from lowest_price_buyer.comparator import evaluate_offers
-from lowest_price_buyer.models import Offer
+from lowest_price_buyer import profiling
+from lowest_price_buyer.batch import iter_keywords, run_batch
+from lowest_price_buyer.comparator import TopKRanker, evaluate_offers
+from lowest_price_buyer.fanout import FanoutResult, fetch_all
+from lowest_price_buyer.models import EvaluatedOffer, Offer
 
 
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(
-        description="Compare effective price (price - points) across marketplaces"
+        description="Compare effective price (price - points) across marketplaces",
+        epilog="Run 'lowest-price-buyer history --help' to query --history-db data and "
+        "'lowest-price-buyer catalog --help' to compile a --manual-offers catalog.",
     )
-    parser.add_argument("keyword", help="Search keyword (e.g. model name)")
+    parser.add_argument("keyword", nargs="?", help="Search keyword (e.g. model name)")
     parser.add_argument(
         "--providers",
         default="yahoo,rakuten,amazon,yodobashi",
         help="Comma separated providers. available: yahoo,rakuten,amazon,yodobashi",
     )
     parser.add_argument("--max-results", type=int, default=5)
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=None,
+        help="Only show the N cheapest offers (default: all)",
+    )
     parser.add_argument("--rakuten-app-id", default=os.getenv("RAKUTEN_APP_ID"))
     parser.add_argument("--yahoo-app-id", default=os.getenv("YAHOO_APP_ID"))
     parser.add_argument(
         "--manual-offers",
         type=Path,
-        help="Optional JSON file of offers to merge. Format: list[Offer-like dict]",
+        help="Offers to merge: a JSON list or NDJSON file of Offer-like dicts, or a "
+        "catalog built with 'lowest-price-buyer catalog' (only offers matching the "
+        "keyword are merged)",
+    )
+    parser.add_argument(
+        "--campaigns",
+        type=Path,
+        help="JSON file of point-campaign rules applied on top of each offer's own points",
     )
     parser.add_argument("--as-json", action="store_true", help="Output as JSON")
+    parser.add_argument(
+        "--group",
+        action="store_true",
+        help="Group offers into products by title and model number, cheapest offer first",
+    )
+    parser.add_argument(
+        "--provider-timeout",
+        type=float,
+        default=20.0,
+        help="Seconds to wait for each provider (default: 20)",
+    )
+    parser.add_argument(
+        "--timeout",
+        type=float,
+        default=None,
+        help="Overall seconds to wait for all providers; late providers are skipped",
+    )
+    parser.add_argument(
+        "--pool-size",
+        type=int,
+        default=16,
+        help="Keep-alive connections kept per marketplace host (default: 16)",
+    )
+    parser.add_argument(
+        "--batch",
+        type=Path,
+        help="Read keywords (one per line) from a file, or '-' for stdin, "
+        "and write one NDJSON record per keyword",
+    )
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=4,
+        help="Keywords searched at once in --batch or --serve mode (default: 4)",
+    )
+    parser.add_argument(
+        "--watch",
+        type=Path,
+        help="Re-poll the keywords in this file (one per line) and print only "
+        "changed offers and new lowest prices as NDJSON",
+    )
+    parser.add_argument(
+        "--interval",
+        type=float,
+        default=300.0,
+        help="Seconds between polls of the same keyword in --watch mode (default: 300)",
+    )
+    parser.add_argument(
+        "--rounds",
+        type=int,
+        default=None,
+        help="Stop --watch after polling every keyword this many times",
+    )
+    parser.add_argument(
+        "--record",
+        type=Path,
+        metavar="ARCHIVE",
+        help="Save every marketplace response to this archive (gzip NDJSON) for --replay",
+    )
+    parser.add_argument(
+        "--replay",
+        type=Path,
+        metavar="ARCHIVE",
+        help="Serve responses from a --record archive instead of the network",
+    )
+    parser.add_argument(
+        "--replay-latency",
+        default="0",
+        help="Delay per replayed response in seconds: fixed (0.2), a uniform range "
+        "(0.05:0.3) or 'recorded' (default: 0)",
+    )
+    parser.add_argument(
+        "--replay-error-rate",
+        type=float,
+        default=0.0,
+        help="Fraction of replayed requests answered with 503 (default: 0)",
+    )
+    parser.add_argument(
+        "--history-db",
+        type=Path,
+        help="Append every ranked offer to this SQLite price-history database",
+    )
+    parser.add_argument(
+        "--serve",
+        metavar="[HOST:]PORT",
+        help="Serve GET /search?keyword=... as JSON, keeping providers warm",
+    )
+    parser.add_argument(
+        "--serve-max-results",
+        type=int,
+        default=50,
+        help="Largest max_results a --serve request may ask for (default: 50)",
+    )
+    parser.add_argument(
+        "--cache-dir",
+        type=Path,
+        help="Cache raw provider responses in this directory",
+    )
+    parser.add_argument(
+        "--cache-ttl",
+        default="600",
+        help="Cache TTL in seconds, optionally per provider (e.g. '600,amazon=300')",
+    )
+    parser.add_argument(
+        "--cache-max-mb",
+        type=float,
+        default=256.0,
+        help="Cache size limit; least recently used entries are evicted (default: 256)",
+    )
+    parser.add_argument(
+        "--rate-limit",
+        default="",
+        help="Requests per second per provider with optional burst, "
+        "e.g. 'yahoo=1,rakuten=1:3,amazon=0.5'",
+    )
+    parser.add_argument(
+        "--max-retries",
+        type=int,
+        default=2,
+        help="Retries after HTTP 429/503, honouring Retry-After (default: 2)",
+    )
+    parser.add_argument(
+        "--breaker-threshold",
+        type=int,
+        default=5,
+        help="Consecutive failures before a provider is skipped (default: 5)",
+    )
+    parser.add_argument(
+        "--breaker-reset",
+        type=float,
+        default=60.0,
+        help="Seconds a failing provider is skipped before it is probed again (default: 60)",
+    )
+    parser.add_argument(
+        "--no-stream",
+        action="store_true",
+        help="Download whole Amazon/Yodobashi pages instead of stopping "
+        "once --max-results offers are parsed",
+    )
+    parser.add_argument(
+        "--html-parser",
+        choices=["auto", "lxml", "html.parser"],
+        default="auto",
+        help="HTML parser for scraped pages; auto prefers lxml when installed",
+    )
+    parser.add_argument(
+        "--parse-workers",
+        type=int,
+        default=0,
+        help="Parse Amazon/Yodobashi HTML in this many worker processes instead of "
+        "provider threads, so parsing uses more than one core (default: 0, in-thread)",
+    )
+    parser.add_argument(
+        "--metrics",
+        type=Path,
+        help="Write per-stage latency histograms and counters as JSON to this file on exit",
+    )
+    parser.add_argument(
+        "--metrics-prom",
+        type=Path,
+        help="Write the same metrics in the Prometheus text format (e.g. for the "
+        "node_exporter textfile collector)",
+    )
+    parser.add_argument(
+        "--profile",
+        type=Path,
+        metavar="DIR",
+        help="Profile fetch and parse per provider, ranking and output formatting; "
+        "write one .pstats file per stage to DIR and print the hottest functions",
+    )
+    parser.add_argument(
+        "--parse-stats",
+        action="store_true",
+        help="Print pages parsed and parse time per provider to stderr",
+    )
     return parser
 
 
-def _build_provider(provider_name: str, args: argparse.Namespace):
+def _provider_options(args: argparse.Namespace) -> dict:
+    from lowest_price_buyer.providers.transport import (
+        ConditionalSession,
+        LazySession,
+        build_session,
+    )
+    from lowest_price_buyer.singleflight import SingleFlight
+
+    if args.replay is not None:
+        from lowest_price_buyer.providers.replay import (
+            ReplaySession,
+            ResponseArchive,
+            parse_latency,
+        )
+
+        session = ReplaySession(
+            ResponseArchive(args.replay),
+            latency=parse_latency(args.replay_latency),
+            error_rate=args.replay_error_rate,
+        )
+    else:
+        # Built on the first request, so cache hits never import requests.
+        session = LazySession(lambda: build_session(pool_maxsize=args.pool_size))
+    if args.record is not None:
+        from lowest_price_buyer.providers.replay import RecordingSession, ResponseArchive
+
+        session = RecordingSession(session, ResponseArchive(args.record))
+    if args.watch is not None:
+        # Repeated polls revalidate with ETag/Last-Modified where supported.
+        session = ConditionalSession(session)
+    options = {
+        "timeout": args.provider_timeout,
+        "session": session,
+        "singleflight": SingleFlight(),
+    }
+    if args.cache_dir is not None:
+        from lowest_price_buyer.cache import ResponseCache, parse_ttl_spec
+
+        default_ttl, ttl = parse_ttl_spec(args.cache_ttl)
+        options["cache"] = ResponseCache(
+            args.cache_dir,
+            default_ttl=default_ttl,
+            ttl=ttl,
+            max_bytes=int(args.cache_max_mb * 1024 * 1024),
+        )
+    if args.parse_workers > 0:
+        from lowest_price_buyer.providers.workers import create_parse_pool
+
+        backend = None if args.html_parser == "auto" else args.html_parser
+        options["parse_executor"] = create_parse_pool(args.parse_workers, backend)
+    return options
+
+
+def _build_provider(provider_name: str, args: argparse.Namespace, options: dict):
+    from lowest_price_buyer.providers.breaker import CircuitBreaker
+    from lowest_price_buyer.providers.ratelimit import RateLimiter, parse_rate_spec
+
+    rate, burst = parse_rate_spec(args.rate_limit).get(provider_name, (None, 1.0))
+    options = {
+        **options,
+        "limiter": RateLimiter(rate=rate, burst=burst, max_retries=args.max_retries),
+        "breaker": CircuitBreaker(
+            failure_threshold=args.breaker_threshold,
+            reset_timeout=args.breaker_reset,
+        ),
+    }
+
     if provider_name == "yahoo":
         if not args.yahoo_app_id:
             print("[skip] yahoo: set YAHOO_APP_ID or --yahoo-app-id")
             return None
         from lowest_price_buyer.providers.yahoo import YahooShoppingProvider
 
-        return YahooShoppingProvider(app_id=args.yahoo_app_id)
+        return YahooShoppingProvider(app_id=args.yahoo_app_id, **options)
 
     if provider_name == "rakuten":
         if not args.rakuten_app_id:
@@ -46,17 +310,17 @@ def _build_provider(provider_name: str, args: argparse.Namespace):
             return None
         from lowest_price_buyer.providers.rakuten import RakutenProvider
 
-        return RakutenProvider(app_id=args.rakuten_app_id)
+        return RakutenProvider(app_id=args.rakuten_app_id, **options)
 
     if provider_name == "amazon":
         from lowest_price_buyer.providers.amazon import AmazonProvider
 
-        return AmazonProvider()
+        return AmazonProvider(stream=not args.no_stream, **options)
 
     if provider_name == "yodobashi":
         from lowest_price_buyer.providers.yodobashi import YodobashiProvider
 
-        return YodobashiProvider()
+        return YodobashiProvider(stream=not args.no_stream, **options)
 
     print(f"[skip] unknown provider: {provider_name}")
     return None
@@ -66,24 +330,19 @@ def _load_manual_offers(path: Path | None) -> list[Offer]:
     if path is None:
         return []
 
-    payload = json.loads(path.read_text(encoding="utf-8"))
-    if not isinstance(payload, list):
-        raise ValueError("manual offers must be a list")
+    from lowest_price_buyer.catalog import iter_offers
+
+    return list(iter_offers(path))
 
-    offers: list[Offer] = []
-    for item in payload:
-        if not isinstance(item, dict):
-            continue
-        offers.append(Offer.from_dict(item))
-    return offers
 
+TABLE_HEADERS = ["provider", "title", "gross_yen", "points_yen", "effective_yen", "url"]
 
-def _print_table(rows: list[dict]) -> None:
+
+def _print_table(rows: list[dict], headers: list[str] = TABLE_HEADERS) -> None:
     if not rows:
         print("No offers found")
         return
 
-    headers = ["provider", "title", "gross_yen", "points_yen", "effective_yen", "url"]
     widths = {header: len(header) for header in headers}
     for row in rows:
         for header in headers:
@@ -96,24 +355,8 @@ def _print_table(rows: list[dict]) -> None:
         print(" | ".join(str(row[h]).ljust(widths[h]) for h in headers))
 
 
-def main() -> int:
-    args = build_parser().parse_args()
-
-    providers = [p.strip().lower() for p in args.providers.split(",") if p.strip()]
-    offers: list[Offer] = _load_manual_offers(args.manual_offers)
-
-    for provider_name in providers:
-        provider = _build_provider(provider_name, args)
-        if provider is None:
-            continue
-
-        try:
-            offers.extend(provider.fetch(args.keyword, max_results=args.max_results))
-        except Exception as exc:
-            print(f"[warn] {provider_name}: {exc}")
-
-    ranked = evaluate_offers(offers)
-    rows = [
+def _to_rows(ranked: list[EvaluatedOffer]) -> list[dict]:
+    return [
         {
             "provider": item.offer.provider,
             "title": item.offer.title,
@@ -125,13 +368,494 @@ def main() -> int:
         for item in ranked
     ]
 
+
+@dataclass
+class _Runtime:
+    """Long-lived state shared by every keyword searched in one process."""
+
+    providers: list
+    manual_offers: list[Offer]
+    options: dict = field(default_factory=dict)
+    history: object | None = None
+    catalog: object | None = None
+    campaigns: object | None = None
+
+    def manual_offers_for(self, keyword: str) -> list[Offer]:
+        if self.catalog is None:
+            return self.manual_offers
+        return self.manual_offers + self.catalog.lookup(keyword)
+
+
+def _search(
+    keyword: str,
+    runtime: _Runtime,
+    args: argparse.Namespace,
+    executor: ThreadPoolExecutor | None = None,
+) -> tuple[list[EvaluatedOffer], FanoutResult]:
+    ranked, result = _rank(keyword, runtime, args, executor)
+    if runtime.history is not None:
+        runtime.history.append(keyword, ranked)
+    return ranked, result
+
+
+def _rank(
+    keyword: str,
+    runtime: _Runtime,
+    args: argparse.Namespace,
+    executor: ThreadPoolExecutor | None,
+) -> tuple[list[EvaluatedOffer], FanoutResult]:
+    ranker = None
+    on_offers = None
+    manual_offers = runtime.manual_offers_for(keyword)
+    if args.top is not None:
+        # Rank incrementally as providers finish instead of sorting everything.
+        ranker = TopKRanker(args.top, runtime.campaigns)
+        with profiling.stage("evaluate"):
+            ranker.extend(manual_offers)
+
+        def on_offers(_: str, offers: list[Offer]) -> None:
+            with profiling.stage("evaluate"):
+                ranker.extend(offers)
+
+    result = fetch_all(
+        runtime.providers,
+        keyword,
+        max_results=args.max_results,
+        provider_timeout=args.provider_timeout,
+        total_timeout=args.timeout,
+        executor=executor,
+        on_offers=on_offers,
+    )
+    if ranker is not None:
+        return ranker.results(), result
+    with profiling.stage("evaluate"):
+        ranked = evaluate_offers(manual_offers + result.offers, campaigns=runtime.campaigns)
+    return ranked, result
+
+
+def _to_products(ranked: list[EvaluatedOffer]) -> list[dict]:
+    from lowest_price_buyer.matching import group_offers
+
+    return [
+        {
+            "product": group.title,
+            "model_numbers": sorted(group.model_numbers),
+            "offers": _to_rows(group.offers),
+        }
+        for group in group_offers(ranked)
+    ]
+
+
+def _to_record(
+    keyword: str, ranked: list[EvaluatedOffer], result: FanoutResult, group: bool = False
+) -> dict:
+    record = {
+        "keyword": keyword,
+        "offers": _to_rows(ranked),
+        "errors": result.errors,
+        "timed_out": result.timed_out,
+    }
+    if group:
+        record["products"] = _to_products(ranked)
+    return record
+
+
+def _run_batch(args: argparse.Namespace, runtime: _Runtime) -> int:
+    def search(keyword: str) -> dict:
+        ranked, result = _search(keyword, runtime, args, executor)
+        with profiling.stage("output"):
+            return _to_record(keyword, ranked, result, args.group)
+
+    workers = max(args.concurrency * max(len(runtime.providers), 1), 1)
+    with contextlib.ExitStack() as stack:
+        executor = stack.enter_context(
+            ThreadPoolExecutor(max_workers=workers, thread_name_prefix="provider")
+        )
+        if str(args.batch) == "-":
+            stream = sys.stdin
+        else:
+            stream = stack.enter_context(args.batch.open(encoding="utf-8"))
+
+        for _, record in run_batch(iter_keywords(stream), search, args.concurrency):
+            sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+            sys.stdout.flush()
+    return 0
+
+
+def _request_overrides(params: dict[str, str], max_results_cap: int) -> dict[str, int]:
+    # ValueError becomes a 400 response.
+    overrides = {}
+    try:
+        if "max_results" in params:
+            overrides["max_results"] = int(params["max_results"])
+        if "top" in params:
+            overrides["top"] = int(params["top"])
+    except ValueError:
+        raise ValueError("max_results and top must be integers") from None
+    if not 1 <= overrides.get("max_results", 1) <= max_results_cap:
+        raise ValueError(f"max_results must be between 1 and {max_results_cap}")
+    if overrides.get("top", 1) < 1:
+        raise ValueError("top must be at least 1")
+    return overrides
+
+
+def _run_server(args: argparse.Namespace, runtime: _Runtime) -> int:
+    from lowest_price_buyer.server import parse_address, serve
+
+    def search(keyword: str, params: dict[str, str]) -> dict:
+        overrides = _request_overrides(params, args.serve_max_results)
+        request_args = argparse.Namespace(**{**vars(args), **overrides})
+        ranked, result = _search(keyword, runtime, request_args, executor)
+        return _to_record(keyword, ranked, result, args.group)
+
+    providers = runtime.providers
+    extra_stats = {
+        "ratelimit": lambda: {p.name: p.limiter.stats.as_dict() for p in providers},
+        "breaker": lambda: {p.name: p.breaker.state for p in providers},
+    }
+    cache = runtime.options.get("cache")
+    if cache is not None:
+        extra_stats["cache"] = cache.stats.as_dict
+    extra_stats["singleflight"] = runtime.options["singleflight"].stats
+
+    workers = max(args.concurrency * max(len(providers), 1), 1)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="provider") as executor:
+        serve(parse_address(args.serve), search, **extra_stats)
+    return 0
+
+
+def _run_watch(args: argparse.Namespace, runtime: _Runtime) -> int:
+    from lowest_price_buyer.watch import watch
+
+    with args.watch.open(encoding="utf-8") as stream:
+        keywords = list(dict.fromkeys(iter_keywords(stream)))
+
+    def search(keyword: str) -> tuple[list[dict], dict[str, str]]:
+        ranked, result = _search(keyword, runtime, args, executor)
+        errors = dict(result.errors)
+        errors.update((name, "timed out") for name in result.timed_out)
+        return _to_rows(ranked), errors
+
+    def emit(record: dict) -> None:
+        sys.stdout.write(json.dumps(record, ensure_ascii=False) + "\n")
+        sys.stdout.flush()
+
+    workers = max(args.concurrency * max(len(runtime.providers), 1), 1)
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="provider") as executor:
+        try:
+            watch(
+                keywords,
+                search,
+                emit,
+                interval=args.interval,
+                concurrency=args.concurrency,
+                rounds=args.rounds,
+                limit=args.top,
+            )
+        except KeyboardInterrupt:
+            pass
+    return 0
+
+
+def _run_single(args: argparse.Namespace, runtime: _Runtime) -> int:
+    ranked, result = _search(args.keyword, runtime, args)
+    for provider_name, error in result.errors.items():
+        print(f"[warn] {provider_name}: {error}")
+    for provider_name in result.timed_out:
+        print(f"[warn] {provider_name}: timed out")
+    with profiling.stage("output"):
+        _print_ranking(args, ranked)
+    return 0
+
+
+def _print_ranking(args: argparse.Namespace, ranked: list[EvaluatedOffer]) -> None:
+    if args.group:
+        products = _to_products(ranked)
+        if args.as_json:
+            print(json.dumps(products, ensure_ascii=False, indent=2))
+            return
+        if not products:
+            print("No offers found")
+        for position, product in enumerate(products):
+            models = ", ".join(product["model_numbers"])
+            if position:
+                print()
+            print(f"== {product['product']}" + (f" [{models}]" if models else ""))
+            _print_table(product["offers"])
+        return
+
+    rows = _to_rows(ranked)
     if args.as_json:
         print(json.dumps(rows, ensure_ascii=False, indent=2))
     else:
         _print_table(rows)
 
+
+def build_history_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="lowest-price-buyer history",
+        description="Query a price-history database written with --history-db",
+    )
+    parser.add_argument("database", type=Path)
+    parser.add_argument("--as-json", action="store_true", help="Output as JSON")
+    queries = parser.add_subparsers(dest="query", required=True)
+
+    lowest = queries.add_parser("lowest", help="Lowest effective prices for a keyword")
+    lowest.add_argument("keyword")
+    lowest.add_argument("--since", default=None, help="Time window, e.g. 90m, 24h, 7d")
+    lowest.add_argument("--limit", type=int, default=5)
+
+    trend = queries.add_parser("trend", help="Price history of one offer URL")
+    trend.add_argument("url")
+    trend.add_argument("--since", default=None, help="Time window, e.g. 90m, 24h, 7d")
+    return parser
+
+
+def _history_main(argv: list[str]) -> int:
+    from datetime import datetime
+
+    from lowest_price_buyer.history import HistoryStore, parse_duration
+
+    parser = build_history_parser()
+    args = parser.parse_args(argv)
+    if not args.database.exists():
+        parser.error(f"no history database at {args.database}")
+
+    since = None
+    if args.since is not None:
+        try:
+            since = time.time() - parse_duration(args.since)
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    with HistoryStore(args.database) as store:
+        if args.query == "lowest":
+            rows = store.lowest(args.keyword, since=since, limit=args.limit)
+        else:
+            rows = store.trend(args.url, since=since)
+
+    for row in rows:
+        row["observed_at"] = datetime.fromtimestamp(row["observed_at"]).isoformat(
+            timespec="seconds"
+        )
+        row["url"] = row["url"] or ""
+    if args.as_json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+    else:
+        _print_table(rows, ["observed_at", *TABLE_HEADERS])
+    return 0
+
+
+def build_catalog_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="lowest-price-buyer catalog",
+        description="Compile a JSON/NDJSON offer file into an indexed catalog for --manual-offers",
+    )
+    parser.add_argument("source", type=Path, help="JSON list or NDJSON file of offers")
+    parser.add_argument("target", type=Path, help="Catalog file to write")
+    return parser
+
+
+def _catalog_main(argv: list[str]) -> int:
+    from lowest_price_buyer.catalog import compile_catalog
+
+    parser = build_catalog_parser()
+    args = parser.parse_args(argv)
+    if not args.source.exists():
+        parser.error(f"no offer file at {args.source}")
+    count = compile_catalog(args.source, args.target)
+    print(f"compiled {count} offers into {args.target}")
     return 0
 
 
+def _print_session_stats(session: object) -> None:
+    from lowest_price_buyer.providers.replay import RecordingSession, ReplaySession
+    from lowest_price_buyer.providers.transport import ConditionalSession
+
+    labels = {
+        ConditionalSession: "conditional",
+        RecordingSession: "record",
+        ReplaySession: "replay",
+    }
+    while type(session) in labels:
+        counters = " ".join(f"{key}={value}" for key, value in session.stats().items())
+        print(f"[{labels[type(session)]}] {counters}", file=sys.stderr)
+        session = getattr(session, "session", None)
+
+
+def _print_profile(profiler: profiling.Profiler) -> None:
+    for summary in profiler.write():
+        print(
+            f"[profile] {summary.name}: runs={summary.runs} "
+            f"total_ms={summary.total_seconds * 1000:.1f} -> {summary.path}",
+            file=sys.stderr,
+        )
+        for seconds, function in summary.hot:
+            print(f"[profile]   {seconds * 1000:8.1f} ms  {function}", file=sys.stderr)
+    if profiler.skipped:
+        print(
+            f"[profile] {profiler.skipped} overlapping stage runs were not profiled",
+            file=sys.stderr,
+        )
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] == "history":
+        return _history_main(argv[1:])
+    if argv and argv[0] == "catalog":
+        return _catalog_main(argv[1:])
+
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.batch is None and args.serve is None and args.watch is None and not args.keyword:
+        parser.error("a keyword, --batch, --watch or --serve is required")
+    if args.serve is not None:
+        from lowest_price_buyer.server import parse_address
+
+        try:
+            parse_address(args.serve)
+        except ValueError:
+            parser.error(f"invalid --serve address: {args.serve}")
+
+    provider_names = [p.strip().lower() for p in args.providers.split(",") if p.strip()]
+    from lowest_price_buyer.catalog import Catalog, is_catalog
+
+    catalog = None
+    if args.manual_offers is not None and is_catalog(args.manual_offers):
+        catalog = Catalog(args.manual_offers)
+        manual_offers = []
+    else:
+        manual_offers = _load_manual_offers(args.manual_offers)
+
+    campaigns = None
+    if args.campaigns is not None:
+        from lowest_price_buyer.campaigns import load_campaigns
+
+        try:
+            campaigns = load_campaigns(args.campaigns)
+        except (OSError, KeyError, TypeError, ValueError) as exc:
+            parser.error(f"invalid --campaigns file: {exc}")
+
+    try:
+        from lowest_price_buyer.cache import parse_ttl_spec
+
+        parse_ttl_spec(args.cache_ttl)
+    except ValueError:
+        parser.error(f"invalid --cache-ttl: {args.cache_ttl}")
+
+    try:
+        from lowest_price_buyer.providers.ratelimit import parse_rate_spec
+
+        parse_rate_spec(args.rate_limit)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    if args.serve_max_results < 1:
+        parser.error("--serve-max-results must be at least 1")
+    if args.breaker_threshold < 1:
+        parser.error("--breaker-threshold must be at least 1")
+    if args.max_results < 1:
+        parser.error("--max-results must be at least 1")
+    if args.concurrency < 1:
+        parser.error("--concurrency must be at least 1")
+    if args.top is not None and args.top < 1:
+        parser.error("--top must be at least 1")
+    if args.parse_workers < 0:
+        parser.error("--parse-workers must be 0 or more")
+    if args.replay is not None:
+        from lowest_price_buyer.providers.replay import parse_latency
+
+        if not args.replay.exists():
+            parser.error(f"no replay archive at {args.replay}")
+        if args.record is not None and args.record.resolve() == args.replay.resolve():
+            parser.error("--record and --replay must use different archives")
+        try:
+            parse_latency(args.replay_latency)
+        except ValueError as exc:
+            parser.error(str(exc))
+        if not 0.0 <= args.replay_error_rate <= 1.0:
+            parser.error("--replay-error-rate must be between 0 and 1")
+        # Credentials are not part of recorded requests; any value replays.
+        args.yahoo_app_id = args.yahoo_app_id or "replay"
+        args.rakuten_app_id = args.rakuten_app_id or "replay"
+    if args.html_parser != "auto":
+        from lowest_price_buyer.providers.soup import set_backend
+
+        try:
+            set_backend(args.html_parser)
+        except ValueError as exc:
+            parser.error(str(exc))
+
+    options = _provider_options(args)
+    # Keep stdout clean for NDJSON records and server logs.
+    streaming = args.batch is not None or args.watch is not None or args.serve is not None
+    redirect = sys.stderr if streaming else sys.stdout
+    with contextlib.redirect_stdout(redirect):
+        built = [_build_provider(name, args, options) for name in provider_names]
+    providers = [provider for provider in built if provider is not None]
+    runtime = _Runtime(
+        providers=providers,
+        manual_offers=manual_offers,
+        options=options,
+        catalog=catalog,
+        campaigns=campaigns,
+    )
+    if args.history_db is not None:
+        from lowest_price_buyer.history import HistoryStore
+
+        runtime.history = HistoryStore(args.history_db)
+
+    if args.profile is not None:
+        profiling.start(args.profile)
+    try:
+        if args.serve is not None:
+            status = _run_server(args, runtime)
+        elif args.watch is not None:
+            status = _run_watch(args, runtime)
+        elif args.batch is not None:
+            status = _run_batch(args, runtime)
+        else:
+            status = _run_single(args, runtime)
+    finally:
+        if runtime.history is not None:
+            runtime.history.close()
+        if runtime.catalog is not None:
+            runtime.catalog.close()
+        if "parse_executor" in options:
+            options["parse_executor"].shutdown()
+
+    cache = options.get("cache")
+    if cache is not None:
+        stats = " ".join(f"{key}={value}" for key, value in cache.stats.as_dict().items())
+        print(f"[cache] {stats}", file=sys.stderr)
+    _print_session_stats(options["session"])
+    for provider in providers:
+        stats = provider.limiter.stats
+        if args.rate_limit or stats.throttled:
+            counters = " ".join(f"{key}={value}" for key, value in stats.as_dict().items())
+            print(f"[ratelimit] {provider.name}: {counters}", file=sys.stderr)
+    if args.metrics is not None or args.metrics_prom is not None:
+        from lowest_price_buyer.metrics import registry
+
+        if args.metrics is not None:
+            args.metrics.write_text(json.dumps(registry.as_dict(), indent=2), encoding="utf-8")
+        if args.metrics_prom is not None:
+            args.metrics_prom.write_text(registry.to_prometheus(), encoding="utf-8")
+    profiler = profiling.stop()
+    if profiler is not None:
+        _print_profile(profiler)
+    if args.parse_stats:
+        from lowest_price_buyer.providers.soup import get_backend, parse_stats
+
+        for name, entry in parse_stats().items():
+            print(
+                f"[parse] {name}: backend={get_backend()} pages={entry['pages']} "
+                f"avg_ms={entry['avg_ms']} total_ms={entry['total_ms']}",
+                file=sys.stderr,
+            )
+    return status
+
+
 if __name__ == "__main__":
     raise SystemExit(main())
@@ -1,29 +1,119 @@
 from __future__ import annotations
 
+import heapq
+import time
+from typing import TYPE_CHECKING, Iterable
+
+from .metrics import registry as metrics
 from .models import EvaluatedOffer, Offer
 from .points import calculate_points
 
+if TYPE_CHECKING:
+    from .campaigns import CampaignBook
+
+
+def evaluate_offer(offer: Offer, bonus_points: int = 0) -> EvaluatedOffer:
+    gross = max(offer.price_yen + offer.shipping_yen, 0)
+    points = calculate_points(offer) + bonus_points
+    effective = max(gross - points, 0)
+    return EvaluatedOffer(
+        offer=offer,
+        gross_price_yen=gross,
+        earned_points_yen=points,
+        effective_price_yen=effective,
+    )
+
+
+def evaluate_offers(
+    offers: list[Offer], limit: int | None = None, campaigns: CampaignBook | None = None
+) -> list[EvaluatedOffer]:
+    started = time.perf_counter()
+    if limit is not None:
+        ranker = TopKRanker(limit, campaigns)
+        ranker.extend(offers)
+        ranked = ranker.results()
+    elif campaigns is not None:
+        bonuses = campaigns.bonus_points(offers)
+        ranked = sorted(map(evaluate_offer, offers, bonuses), key=_rank_key)
+    else:
+        ranked = sorted((evaluate_offer(offer) for offer in offers), key=_rank_key)
+    metrics.observe("evaluate_seconds", time.perf_counter() - started)
+    metrics.inc("evaluated_offers_total", len(offers))
+    return ranked
+
+
+def _rank_key(item: EvaluatedOffer) -> tuple[int, int, str]:
+    return (item.effective_price_yen, item.gross_price_yen, item.offer.provider)
+
+
+class _Entry:
+    """Heap entry ordered so that the worst-ranked offer is at the heap top."""
+
+    __slots__ = ("key", "item")
 
-def evaluate_offers(offers: list[Offer]) -> list[EvaluatedOffer]:
-    evaluated: list[EvaluatedOffer] = []
-    for offer in offers:
+    def __init__(self, key: tuple, item: EvaluatedOffer):
+        self.key = key
+        self.item = item
+
+    def __lt__(self, other: _Entry) -> bool:
+        return self.key > other.key
+
+
+class TopKRanker:
+    """Keep the ``k`` cheapest offers, ranked like ``evaluate_offers``, as they stream in."""
+
+    def __init__(self, k: int, campaigns: CampaignBook | None = None):
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self.k = k
+        self.campaigns = campaigns
+        self.seen = 0
+        self._heap: list[_Entry] = []
+        self._best: _Entry | None = None
+
+    def add(self, offer: Offer, bonus_points: int | None = None) -> None:
         gross = max(offer.price_yen + offer.shipping_yen, 0)
-        points = calculate_points(offer)
+        if bonus_points is None:
+            bonus_points = self.campaigns.bonus_points([offer])[0] if self.campaigns else 0
+        points = calculate_points(offer) + bonus_points
         effective = max(gross - points, 0)
-        evaluated.append(
+        key = (effective, gross, offer.provider, self.seen)
+        self.seen += 1
+
+        # Reject before building an EvaluatedOffer when the heap is full.
+        if len(self._heap) >= self.k and key >= self._heap[0].key:
+            return
+
+        entry = _Entry(
+            key,
             EvaluatedOffer(
                 offer=offer,
                 gross_price_yen=gross,
                 earned_points_yen=points,
                 effective_price_yen=effective,
-            )
+            ),
         )
+        if len(self._heap) < self.k:
+            heapq.heappush(self._heap, entry)
+        else:
+            heapq.heapreplace(self._heap, entry)
+        if self._best is None or key < self._best.key:
+            self._best = entry
 
-    return sorted(
-        evaluated,
-        key=lambda item: (
-            item.effective_price_yen,
-            item.gross_price_yen,
-            item.offer.provider,
-        ),
-    )
+    def extend(self, offers: Iterable[Offer]) -> None:
+        if self.campaigns is None:
+            for offer in offers:
+                self.add(offer, 0)
+            return
+        offers = list(offers)
+        for offer, bonus in zip(offers, self.campaigns.bonus_points(offers)):
+            self.add(offer, bonus)
+
+    def best(self) -> EvaluatedOffer | None:
+        return self._best.item if self._best is not None else None
+
+    def results(self) -> list[EvaluatedOffer]:
+        return [entry.item for entry in sorted(self._heap, key=lambda entry: entry.key)]
+
+    def __len__(self) -> int:
+        return len(self._heap)
@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Executor, Future, wait
+from dataclasses import dataclass, field
+from typing import Any, Callable
+
+from .models import Offer
+from .providers.base import BaseProvider
+from .providers.deadline import deadline
+
+
+@dataclass
+class FanoutResult:
+    offers: list[Offer] = field(default_factory=list)
+    errors: dict[str, str] = field(default_factory=dict)
+    timed_out: list[str] = field(default_factory=list)
+
+
+def fetch_all(
+    providers: list[BaseProvider],
+    keyword: str,
+    max_results: int = 5,
+    provider_timeout: float | None = None,
+    total_timeout: float | None = None,
+    executor: Executor | None = None,
+    on_offers: Callable[[str, list[Offer]], None] | None = None,
+) -> FanoutResult:
+    """Run every provider's fetch at once and collect what arrives in time.
+
+    Each provider gets ``provider_timeout`` seconds from when its task starts
+    and the whole fan-out gets ``total_timeout`` seconds. Providers still
+    running when their budget is spent are reported in ``timed_out`` and their
+    late results are discarded. The budget is also their request deadline, so
+    abandoned fetches stop soon after. Without ``executor`` each provider runs
+    on a daemon thread, which does not hold up interpreter exit. Offers are
+    returned in provider order.
+
+    ``on_offers`` is called from the calling thread with each provider's offers
+    as soon as that provider finishes, so callers can rank incrementally.
+    """
+    result = FanoutResult()
+    if not providers:
+        return result
+
+    overall_deadline = time.monotonic() + total_timeout if total_timeout is not None else None
+    pending: dict[Future, int] = {}
+    # Provider deadlines, set by each task when it starts running.
+    deadlines: dict[int, float | None] = {}
+    collected: dict[int, list[Offer]] = {}
+
+    def run(index: int) -> list[Offer]:
+        at = overall_deadline
+        if provider_timeout is not None:
+            at = _earliest(time.monotonic() + provider_timeout, at)
+        deadlines[index] = at
+        with deadline(at):
+            return providers[index].fetch(keyword, max_results=max_results)
+
+    submit = executor.submit if executor is not None else _spawn
+    try:
+        for index in range(len(providers)):
+            pending[submit(run, index)] = index
+
+        while pending:
+            now = time.monotonic()
+            # Until a task starts, only the overall deadline applies to it.
+            expired = [
+                future
+                for future, index in pending.items()
+                if _expired(deadlines.get(index, overall_deadline), now)
+            ]
+            for future in expired:
+                index = pending.pop(future)
+                future.cancel()
+                result.timed_out.append(providers[index].name)
+
+            if not pending:
+                break
+
+            # A task that has not started yet has at least provider_timeout left.
+            unstarted = overall_deadline
+            if provider_timeout is not None:
+                unstarted = _earliest(now + provider_timeout, overall_deadline)
+            wait_until = None
+            for index in pending.values():
+                wait_until = _earliest(deadlines.get(index, unstarted), wait_until)
+            wait_for = max(wait_until - now, 0.0) if wait_until is not None else None
+            done, _ = wait(list(pending), timeout=wait_for, return_when=FIRST_COMPLETED)
+            for future in done:
+                index = pending.pop(future)
+                try:
+                    collected[index] = future.result()
+                except Exception as exc:
+                    # Requests cut short by the deadline count as timeouts.
+                    if _expired(deadlines.get(index), time.monotonic()):
+                        result.timed_out.append(providers[index].name)
+                    else:
+                        result.errors[providers[index].name] = str(exc)
+                    continue
+                if on_offers is not None:
+                    on_offers(providers[index].name, collected[index])
+    finally:
+        for future in pending:
+            future.cancel()
+
+    for index in sorted(collected):
+        result.offers.extend(collected[index])
+    return result
+
+
+def _expired(at: float | None, now: float) -> bool:
+    return at is not None and now >= at
+
+
+def _earliest(a: float | None, b: float | None) -> float | None:
+    if a is None:
+        return b
+    return a if b is None else min(a, b)
+
+
+def _spawn(fn: Callable[..., Any], *args: Any) -> Future:
+    future: Future = Future()
+
+    def run() -> None:
+        if not future.set_running_or_notify_cancel():
+            return
+        try:
+            future.set_result(fn(*args))
+        except BaseException as exc:
+            future.set_exception(exc)
+
+    threading.Thread(target=run, name="provider", daemon=True).start()
+    return future
@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Iterable
+
+from .models import EvaluatedOffer
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS offers (
+    id INTEGER PRIMARY KEY,
+    observed_at REAL NOT NULL,
+    keyword TEXT NOT NULL,
+    provider TEXT NOT NULL,
+    title TEXT NOT NULL,
+    url TEXT,
+    gross_yen INTEGER NOT NULL,
+    points_yen INTEGER NOT NULL,
+    effective_yen INTEGER NOT NULL
+);
+-- Lowest price per keyword: walk one keyword in price order, filter by time.
+CREATE INDEX IF NOT EXISTS offers_keyword_price
+    ON offers (keyword, effective_yen, observed_at);
+-- Price trend per URL: a range scan in time order.
+CREATE INDEX IF NOT EXISTS offers_url_time
+    ON offers (url, observed_at);
+"""
+
+COLUMNS = (
+    "observed_at",
+    "keyword",
+    "provider",
+    "title",
+    "url",
+    "gross_yen",
+    "points_yen",
+    "effective_yen",
+)
+
+
+class HistoryStore:
+    """Append-only SQLite log of evaluated offers.
+
+    Rows are buffered and written with ``executemany`` in one transaction per
+    ``flush``; ``append`` flushes on its own once ``batch_size`` rows are
+    pending. The connection is shared between threads behind a lock.
+    """
+
+    def __init__(self, path: Path | str, batch_size: int = 1000):
+        self.path = str(path)
+        self.batch_size = batch_size
+        self._pending: list[tuple] = []
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+
+    def append(
+        self,
+        keyword: str,
+        ranked: Iterable[EvaluatedOffer],
+        observed_at: float | None = None,
+    ) -> None:
+        observed_at = time.time() if observed_at is None else observed_at
+        rows = [
+            (
+                observed_at,
+                keyword,
+                item.offer.provider,
+                item.offer.title,
+                item.offer.url,
+                item.gross_price_yen,
+                item.earned_points_yen,
+                item.effective_price_yen,
+            )
+            for item in ranked
+        ]
+        with self._lock:
+            self._pending.extend(rows)
+            if len(self._pending) >= self.batch_size:
+                self._flush_locked()
+
+    def flush(self) -> None:
+        with self._lock:
+            self._flush_locked()
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            self._conn.close()
+
+    def lowest(
+        self, keyword: str, since: float | None = None, limit: int = 1
+    ) -> list[dict]:
+        """Cheapest observations for ``keyword`` at or after ``since``."""
+        self.flush()
+        query = f"SELECT {', '.join(COLUMNS)} FROM offers WHERE keyword = ?"
+        params: list = [keyword]
+        if since is not None:
+            query += " AND observed_at >= ?"
+            params.append(since)
+        query += " ORDER BY effective_yen, observed_at DESC LIMIT ?"
+        params.append(limit)
+        return self._select(query, params)
+
+    def trend(self, url: str, since: float | None = None) -> list[dict]:
+        """Observations of one offer URL in time order."""
+        self.flush()
+        query = f"SELECT {', '.join(COLUMNS)} FROM offers WHERE url = ?"
+        params: list = [url]
+        if since is not None:
+            query += " AND observed_at >= ?"
+            params.append(since)
+        query += " ORDER BY observed_at"
+        return self._select(query, params)
+
+    def __enter__(self) -> HistoryStore:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    def _flush_locked(self) -> None:
+        if not self._pending:
+            return
+        placeholders = ", ".join("?" for _ in COLUMNS)
+        with self._conn:
+            self._conn.executemany(
+                f"INSERT INTO offers ({', '.join(COLUMNS)}) VALUES ({placeholders})",
+                self._pending,
+            )
+        self._pending.clear()
+
+    def _select(self, query: str, params: list) -> list[dict]:
+        with self._lock:
+            cursor = self._conn.execute(query, params)
+            return [dict(zip(COLUMNS, row)) for row in cursor.fetchall()]
+
+
+_DURATION = re.compile(r"^\s*([0-9]+(?:\.[0-9]+)?)\s*([smhd]?)\s*$")
+_UNITS = {"": 1, "s": 1, "m": 60, "h": 3600, "d": 86400}
+
+
+def parse_duration(value: str) -> float:
+    """Parse ``"90"``, ``"30m"``, ``"24h"`` or ``"7d"`` into seconds."""
+    match = _DURATION.match(value)
+    if not match:
+        raise ValueError(f"invalid duration: {value!r}")
+    return float(match.group(1)) * _UNITS[match.group(2)]
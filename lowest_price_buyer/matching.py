@@ -0,0 +1,161 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+
+from .models import EvaluatedOffer
+
+
+GRAM_SIZE = 3
+DEFAULT_THRESHOLD = 0.6
+# Grams shared by more offers than this stop collecting postings, so common
+# words ("nintendo", "送料無料") cannot make candidate generation quadratic.
+MAX_POSTINGS = 100
+MAX_CANDIDATES = 50
+
+# NFKC leaves these dash look-alikes alone; fold them into "-".
+_DASHES = str.maketrans({c: "-" for c in "‐‑‒–—―−﹣"})
+_WORD = re.compile(r"[0-9a-z]+(?:-[0-9a-z]+)*|[^\W0-9a-z_]+")
+# Letters followed by digits, optionally hyphenated: HAC-001, WH-1000XM5, CFI-2000A01.
+_MODEL = re.compile(r"(?<![0-9a-z])([a-z]{1,6})-?([0-9]{2,}[0-9a-z]*(?:-[0-9a-z]+)*)(?![0-9a-z])")
+
+
+def normalize_title(title: str) -> str:
+    """Fold width variants, case and dashes, and collapse whitespace."""
+    text = unicodedata.normalize("NFKC", title).translate(_DASHES).lower()
+    return " ".join(text.split())
+
+
+def model_numbers(normalized: str) -> frozenset[str]:
+    """Model numbers in a normalized title, upper-cased without hyphens."""
+    return frozenset(
+        (prefix + rest).replace("-", "").upper() for prefix, rest in _MODEL.findall(normalized)
+    )
+
+
+def title_words(normalized: str) -> list[str]:
+    """Latin/digit runs and runs of other letters (kana, kanji), without hyphens."""
+    return [word.replace("-", "") for word in _WORD.findall(normalized)]
+
+
+def title_grams(normalized: str, size: int = GRAM_SIZE) -> frozenset[str]:
+    """Character n-grams per word; words shorter than ``size`` are kept whole.
+
+    Working per word keeps grams meaningful for both space-separated Latin
+    titles and Japanese titles that have few spaces.
+    """
+    grams: set[str] = set()
+    for word in title_words(normalized):
+        if len(word) <= size:
+            grams.add(word)
+            continue
+        grams.update(word[i : i + size] for i in range(len(word) - size + 1))
+    return frozenset(grams)
+
+
+@dataclass
+class ProductGroup:
+    """Offers believed to be the same product, cheapest first."""
+
+    title: str
+    model_numbers: frozenset[str]
+    offers: list[EvaluatedOffer] = field(default_factory=list)
+
+    @property
+    def lowest(self) -> EvaluatedOffer:
+        return self.offers[0]
+
+
+class _UnionFind:
+    __slots__ = ("parent", "models")
+
+    def __init__(self, models: list[frozenset[str]]):
+        self.parent = list(range(len(models)))
+        # Model numbers of each set, kept on its root.
+        self.models = list(models)
+
+    def find(self, item: int) -> int:
+        parent = self.parent
+        root = item
+        while parent[root] != root:
+            root = parent[root]
+        while parent[item] != root:
+            parent[item], item = root, parent[item]
+        return root
+
+    def union(self, a: int, b: int) -> None:
+        root_a, root_b = self.find(a), self.find(b)
+        if root_a == root_b:
+            return
+        models_a, models_b = self.models[root_a], self.models[root_b]
+        # A title without a model number must not bridge two different models.
+        if models_a and models_b and not models_a & models_b:
+            return
+        # Keep the smaller index as root so a group is named after its first offer.
+        if root_b < root_a:
+            root_a, root_b = root_b, root_a
+        self.parent[root_b] = root_a
+        self.models[root_a] = models_a | models_b
+
+
+def group_offers(
+    ranked: list[EvaluatedOffer],
+    threshold: float = DEFAULT_THRESHOLD,
+    max_postings: int = MAX_POSTINGS,
+) -> list[ProductGroup]:
+    """Cluster ranked offers into products without pairwise title comparison.
+
+    Titles are normalized and split into n-grams. An inverted index from gram to
+    offers yields a handful of candidates per offer, and two offers are merged
+    when the Jaccard similarity of their grams reaches ``threshold``. Groups
+    whose model numbers are disjoint are never merged, even through a title
+    without a model number, so "HAC-001" and "HEG-001" stay apart however
+    similar the rest of the title is. Identical
+    normalized titles are merged up front.
+
+    ``ranked`` should come from ``evaluate_offers``; each group keeps that order,
+    so ``group.lowest`` is its cheapest offer. Groups are returned largest
+    first (the searched product usually has the most offers), then cheapest.
+    """
+    count = len(ranked)
+    normalized = [normalize_title(item.offer.title) for item in ranked]
+    models = [model_numbers(title) for title in normalized]
+    grams = [title_grams(title) for title in normalized]
+    sets = _UnionFind(models)
+
+    first_seen: dict[str, int] = {}
+    index: dict[str, list[int]] = {}
+    for i in range(count):
+        same = first_seen.setdefault(normalized[i], i)
+        if same != i:
+            sets.union(same, i)
+            continue
+
+        shared: Counter[int] = Counter()
+        for gram in grams[i]:
+            postings = index.get(gram)
+            if postings is None:
+                index[gram] = [i]
+            elif len(postings) < max_postings:
+                shared.update(postings)
+                postings.append(i)
+
+        for j, _ in shared.most_common(MAX_CANDIDATES):
+            if sets.find(i) == sets.find(j):
+                continue
+            overlap = len(grams[i] & grams[j])
+            union = len(grams[i]) + len(grams[j]) - overlap
+            if union and overlap / union >= threshold:
+                sets.union(i, j)
+
+    groups: dict[int, ProductGroup] = {}
+    for i, item in enumerate(ranked):
+        root = sets.find(i)
+        group = groups.get(root)
+        if group is None:
+            group = groups[root] = ProductGroup(item.offer.title, sets.models[root])
+        group.offers.append(item)
+
+    return sorted(groups.values(), key=lambda g: (-len(g.offers), g.lowest.effective_price_yen))
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import bisect
+import contextlib
+import math
+import threading
+import time
+from typing import Iterator
+
+PREFIX = "lowest_price_buyer_"
+# Seconds; wide enough for both sub-millisecond ranking and slow marketplace pages.
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+DESCRIPTIONS = {
+    "fetch_seconds": "Provider fetch latency including cache, download and parse",
+    "fetch_errors_total": "Provider fetches that raised",
+    "offers_total": "Offers returned by provider fetches",
+    "download_seconds": "Time spent in fetch_raw (network and reading the body)",
+    "parse_seconds": "Time spent turning a raw payload into offers",
+    "payload_bytes_total": "Bytes of HTML downloaded by scraper providers",
+    "http_seconds": "fetch_json request latency per host",
+    "http_ttfb_seconds": "Time until response headers arrived (connect and server time)",
+    "http_requests_total": "fetch_json requests per host and status code",
+    "http_response_bytes_total": "fetch_json response body bytes per host",
+    "evaluate_seconds": "evaluate_offers latency",
+    "evaluated_offers_total": "Offers ranked by evaluate_offers",
+    "request_seconds": "Server /search latency",
+}
+
+Labels = tuple[tuple[str, str], ...]
+
+
+class Histogram:
+    """Fixed-bucket histogram; ``counts[i]`` holds values ``<= buckets[i]``."""
+
+    __slots__ = ("buckets", "counts", "count", "sum")
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def cumulative(self) -> list[tuple[float, int]]:
+        total = 0
+        result = []
+        for bound, count in zip((*self.buckets, math.inf), self.counts):
+            total += count
+            result.append((bound, total))
+        return result
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms keyed by name and labels.
+
+    Names are given without the ``lowest_price_buyer_`` prefix, which is added
+    on export. ``as_dict`` is the ``--metrics`` JSON blob and
+    ``to_prometheus`` the text exposition format.
+    """
+
+    def __init__(self) -> None:
+        self._counters: dict[tuple[str, Labels], float] = {}
+        self._histograms: dict[tuple[str, Labels], Histogram] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, name: str, amount: float = 1, **labels: str) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            self._counters[key] = self._counters.get(key, 0) + amount
+
+    def observe(self, name: str, value: float, **labels: str) -> None:
+        key = (name, _labels(labels))
+        with self._lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(value)
+
+    @contextlib.contextmanager
+    def time(self, name: str, **labels: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+            self._histograms.clear()
+
+    def as_dict(self) -> dict[str, list[dict]]:
+        result: dict[str, list[dict]] = {}
+        with self._lock:
+            for (name, labels), value in sorted(self._counters.items()):
+                result.setdefault(name, []).append({"labels": dict(labels), "value": value})
+            for (name, labels), histogram in sorted(self._histograms.items()):
+                result.setdefault(name, []).append(
+                    {
+                        "labels": dict(labels),
+                        "count": histogram.count,
+                        "sum": round(histogram.sum, 6),
+                        "avg": round(histogram.sum / histogram.count, 6),
+                        "buckets": {
+                            _format_bound(bound): count for bound, count in histogram.cumulative()
+                        },
+                    }
+                )
+        return result
+
+    def to_prometheus(self) -> str:
+        lines: list[str] = []
+        with self._lock:
+            counters = sorted(self._counters.items())
+            histograms = sorted(
+                (key, histogram.cumulative(), histogram.count, histogram.sum)
+                for key, histogram in self._histograms.items()
+            )
+
+        declared: set[str] = set()
+        for (name, labels), value in counters:
+            _declare(lines, declared, name, "counter")
+            lines.append(f"{PREFIX}{name}{_format_labels(labels)} {_format_value(value)}")
+        for (name, labels), cumulative, count, total in histograms:
+            _declare(lines, declared, name, "histogram")
+            for bound, bucket_count in cumulative:
+                bucket_labels = labels + (("le", _format_bound(bound)),)
+                lines.append(f"{PREFIX}{name}_bucket{_format_labels(bucket_labels)} {bucket_count}")
+            lines.append(f"{PREFIX}{name}_sum{_format_labels(labels)} {_format_value(total)}")
+            lines.append(f"{PREFIX}{name}_count{_format_labels(labels)} {count}")
+        return "\n".join(lines) + "\n" if lines else ""
+
+
+registry = MetricsRegistry()
+
+
+def _labels(labels: dict[str, str]) -> Labels:
+    return tuple(sorted((key, str(value)) for key, value in labels.items()))
+
+
+def _declare(lines: list[str], declared: set[str], name: str, kind: str) -> None:
+    if name in declared:
+        return
+    declared.add(name)
+    if name in DESCRIPTIONS:
+        lines.append(f"# HELP {PREFIX}{name} {DESCRIPTIONS[name]}")
+    lines.append(f"# TYPE {PREFIX}{name} {kind}")
+
+
+def _format_labels(labels: Labels) -> str:
+    if not labels:
+        return ""
+    escaped = (
+        (key, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for key, value in labels
+    )
+    return "{" + ",".join(f'{key}="{value}"' for key, value in escaped) + "}"
+
+
+def _format_bound(bound: float) -> str:
+    return "+Inf" if bound == math.inf else repr(float(bound))
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
+import sys
 from dataclasses import dataclass
 
+# Slotted instances drop the per-instance __dict__; dataclass(slots=True)
+# needs Python 3.10, so older interpreters fall back to regular dataclasses.
+_SLOTS = {"slots": True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_SLOTS)
 class Offer:
     provider: str
     title: str
@@ -12,6 +17,8 @@ class Offer:
     point_rate: float | None = None
     point_amount_yen: int | None = None
     url: str | None = None
+    # Shop within a marketplace provider, for store-specific point campaigns.
+    store: str | None = None
 
     @classmethod
     def from_dict(cls, data: dict) -> "Offer":
@@ -27,10 +34,11 @@ class Offer:
                 else None
             ),
             url=data.get("url"),
+            store=str(data["store"]) if data.get("store") is not None else None,
         )
 
 
-@dataclass
+@dataclass(**_SLOTS)
 class EvaluatedOffer:
     offer: Offer
     gross_price_yen: int
@@ -0,0 +1,106 @@
+from __future__ import annotations
+
+import contextlib
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import TYPE_CHECKING, ContextManager, Iterator
+
+if TYPE_CHECKING:
+    import cProfile
+
+_NULL = contextlib.nullcontext()
+_active: Profiler | None = None
+
+
+@dataclass
+class StageProfile:
+    name: str
+    path: Path
+    runs: int
+    total_seconds: float
+    # (seconds spent in the function itself, "file:line(function)")
+    hot: list[tuple[float, str]]
+
+
+class Profiler:
+    """Collect one cProfile per stage run and merge them per stage name.
+
+    cProfile only sees the thread that enabled it, so each provider thread
+    profiles its own stage and the results are merged afterwards. Stages must
+    not nest. On Python 3.12+ only one profiler can be active per process;
+    stage runs that overlap another are counted in ``skipped`` instead.
+    """
+
+    def __init__(self, directory: Path | str):
+        self.directory = Path(directory)
+        self.skipped = 0
+        self._profiles: dict[str, list[cProfile.Profile]] = {}
+        self._lock = threading.Lock()
+
+    @contextlib.contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        import cProfile
+
+        profile = cProfile.Profile()
+        try:
+            profile.enable()
+        except ValueError:
+            with self._lock:
+                self.skipped += 1
+            profile = None
+        try:
+            yield
+        finally:
+            if profile is not None:
+                profile.disable()
+                with self._lock:
+                    self._profiles.setdefault(name, []).append(profile)
+
+    def write(self, top: int = 5) -> list[StageProfile]:
+        """Write ``<stage>.pstats`` files and return a summary per stage."""
+        import pstats
+
+        self.directory.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            profiles = {name: list(runs) for name, runs in self._profiles.items()}
+
+        summaries = []
+        for name, runs in sorted(profiles.items()):
+            stats = pstats.Stats(runs[0])
+            for profile in runs[1:]:
+                stats.add(profile)
+            path = self.directory / f"{name}.pstats"
+            stats.dump_stats(path)
+            entries = sorted(stats.stats.items(), key=lambda item: item[1][2], reverse=True)
+            hot = [(timing[2], _describe(function)) for function, timing in entries[:top]]
+            summaries.append(StageProfile(name, path, len(runs), stats.total_tt, hot))
+        return summaries
+
+
+def start(directory: Path | str) -> Profiler:
+    global _active
+    _active = Profiler(directory)
+    return _active
+
+
+def stop() -> Profiler | None:
+    global _active
+    profiler, _active = _active, None
+    return profiler
+
+
+def stage(name: str) -> ContextManager[None]:
+    """Profile the block as ``name`` when profiling is on; a no-op otherwise."""
+    profiler = _active
+    if profiler is None:
+        return _NULL
+    return profiler.stage(name)
+
+
+def _describe(function: tuple[str, int, str]) -> str:
+    filename, line, name = function
+    if filename == "~":
+        return name  # built-in
+    parts = Path(filename).parts
+    return f"{'/'.join(parts[-2:])}:{line}({name})"
@@ -1,35 +1,37 @@
 from __future__ import annotations
 
 import re
-from urllib.parse import quote_plus, urljoin
-
-import requests
-from bs4 import BeautifulSoup
+from typing import Any
+from urllib.parse import urljoin
 
 from lowest_price_buyer.models import Offer
-from lowest_price_buyer.providers.base import BaseProvider, ProviderError
+from lowest_price_buyer.providers.base import ProviderError
+from lowest_price_buyer.providers.scraper import ScraperProvider
+from lowest_price_buyer.providers.soup import make_soup, timed_parse
+from lowest_price_buyer.providers.stream import attr
 
 
-SEARCH_URL = "https://www.amazon.co.jp/s"
-USER_AGENT = (
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) "
-    "Chrome/122.0.0.0 Safari/537.36"
-)
+SEARCH_URL = "https://www.amazon.co.jp/s?k="
 
 
-class AmazonProvider(BaseProvider):
+class AmazonProvider(ScraperProvider):
     name = "amazon"
+    search_url = SEARCH_URL
+
+    def card_key(self, tag: str, attrs: list[tuple[str, Any]]) -> object | None:
+        return _card_key(tag, attrs)
 
-    def fetch(self, keyword: str, max_results: int = 5) -> list[Offer]:
-        url = f"{SEARCH_URL}?k={quote_plus(keyword)}"
-        response = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=20)
-        response.raise_for_status()
-        return parse_amazon_html(response.text, max_results=max_results)
+    def parse(self, raw: str, max_results: int = 5) -> list[Offer]:
+        return self.run_parse(parse_amazon_html, raw, max_results)
 
 
 def parse_amazon_html(html: str, max_results: int = 5) -> list[Offer]:
-    soup = BeautifulSoup(html, "html.parser")
+    with timed_parse("amazon"):
+        return _parse_amazon_html(html, max_results)
+
+
+def _parse_amazon_html(html: str, max_results: int) -> list[Offer]:
+    soup = make_soup(html)
     offers: list[Offer] = []
 
     for node in soup.select("div.s-result-item[data-component-type='s-search-result']"):
@@ -81,3 +83,9 @@ def _extract_points(text: str) -> int | None:
     if not match:
         return None
     return int(match.group(1).replace(",", ""))
+
+
+def _card_key(tag: str, attrs: list[tuple[str, Any]]) -> object | None:
+    if tag == "div" and attr(attrs, "data-component-type") == "s-search-result":
+        return object()  # every result div is a new card
+    return None
@@ -1,10 +1,31 @@
 from __future__ import annotations
 
+import contextlib
+import contextvars
+import math
+import time
 from abc import ABC, abstractmethod
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Callable, Iterator
+from urllib.parse import urlsplit
 
-import requests
-
+from lowest_price_buyer import profiling
+from lowest_price_buyer.metrics import registry as metrics
 from lowest_price_buyer.models import Offer
+from lowest_price_buyer.providers import deadline
+from lowest_price_buyer.providers.transport import get_session
+
+if TYPE_CHECKING:
+    import requests
+
+    from lowest_price_buyer.cache import ResponseCache
+    from lowest_price_buyer.providers.breaker import CircuitBreaker
+    from lowest_price_buyer.providers.ratelimit import RateLimiter
+    from lowest_price_buyer.singleflight import SingleFlight
+
+
+DEFAULT_TIMEOUT = 20.0
+DEFAULT_PAGE_WORKERS = 4
 
 
 class ProviderError(RuntimeError):
@@ -14,12 +35,153 @@ class ProviderError(RuntimeError):
 class BaseProvider(ABC):
     name: str
 
-    @abstractmethod
+    def __init__(
+        self,
+        timeout: float = DEFAULT_TIMEOUT,
+        session: requests.Session | None = None,
+        cache: ResponseCache | None = None,
+        limiter: RateLimiter | None = None,
+        breaker: CircuitBreaker | None = None,
+        singleflight: SingleFlight | None = None,
+        parse_executor: Executor | None = None,
+    ):
+        self.timeout = timeout
+        self.session = session if session is not None else get_session()
+        self.cache = cache
+        self.limiter = limiter
+        if limiter is not None:
+            self.session = limiter.wrap(self.session)
+        self.breaker = breaker
+        self.singleflight = singleflight
+        self.parse_executor = parse_executor
+
     def fetch(self, keyword: str, max_results: int = 5) -> list[Offer]:
+        started = time.perf_counter()
+        try:
+            if self.singleflight is None:
+                offers = self._fetch(keyword, max_results)
+            else:
+                # Concurrent identical queries share one request and its parsed offers.
+                offers = list(
+                    self.singleflight.do(
+                        (self.name, keyword, max_results),
+                        lambda: self._fetch(keyword, max_results),
+                    )
+                )
+        except Exception:
+            metrics.inc("fetch_errors_total", provider=self.name)
+            raise
+        finally:
+            metrics.observe("fetch_seconds", time.perf_counter() - started, provider=self.name)
+        metrics.inc("offers_total", len(offers), provider=self.name)
+        return offers
+
+    def _fetch(self, keyword: str, max_results: int) -> list[Offer]:
+        if self.cache is not None:
+            raw = self.cache.get(self.name, keyword, max_results)
+            if raw is not None:
+                with self._stage("parse_seconds", "parse"):
+                    return self.parse(raw, max_results=max_results)
+
+        if self.breaker is not None:
+            self.breaker.before_call()
+        try:
+            with self._stage("download_seconds", "fetch"):
+                raw, offers = self.fetch_payload(keyword, max_results=max_results)
+            if offers is None:
+                with self._stage("parse_seconds", "parse"):
+                    offers = self.parse(raw, max_results=max_results)
+        except Exception:
+            if self.breaker is not None:
+                self.breaker.record_failure()
+            raise
+        if self.breaker is not None:
+            self.breaker.record_success()
+
+        # Only payloads that parsed are cached, so error pages are not pinned.
+        if self.cache is not None:
+            self.cache.put(self.name, keyword, max_results, raw)
+        return offers
+
+    @contextlib.contextmanager
+    def _stage(self, metric: str, stage: str) -> Iterator[None]:
+        with metrics.time(metric, provider=self.name), profiling.stage(f"{stage}.{self.name}"):
+            yield
+
+    def run_parse(
+        self, parse: Callable[[Any, int], list[Offer]], raw: Any, max_results: int
+    ) -> list[Offer]:
+        """Call a module-level ``parse(raw, max_results)``, in ``parse_executor`` if set."""
+        if self.parse_executor is None:
+            return parse(raw, max_results)
+        from lowest_price_buyer.providers.workers import parse_in_pool
+
+        return parse_in_pool(self.parse_executor, parse, raw, max_results)
+
+    def request_timeout(self) -> float:
+        """``timeout`` clamped to what is left of the current fetch's deadline."""
+        return deadline.request_timeout(self.timeout)
+
+    def fetch_payload(self, keyword: str, max_results: int = 5) -> tuple[Any, list[Offer] | None]:
+        """Download the payload, with its offers if they were parsed while downloading."""
+        return self.fetch_raw(keyword, max_results=max_results), None
+
+    @abstractmethod
+    def fetch_raw(self, keyword: str, max_results: int = 5) -> Any:
+        """Download the unparsed payload (decoded JSON or HTML text)."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def parse(self, raw: Any, max_results: int = 5) -> list[Offer]:
         raise NotImplementedError
 
 
-def fetch_json(url: str, params: dict, timeout: int = 20) -> dict:
-    response = requests.get(url, params=params, timeout=timeout)
+def fetch_json(
+    url: str,
+    params: dict,
+    timeout: float = DEFAULT_TIMEOUT,
+    session: requests.Session | None = None,
+) -> dict:
+    host = urlsplit(url).hostname or ""
+    started = time.perf_counter()
+    response = (session or get_session()).get(url, params=params, timeout=timeout)
+    metrics.observe("http_seconds", time.perf_counter() - started, host=host)
+    if response.elapsed is not None:
+        metrics.observe("http_ttfb_seconds", response.elapsed.total_seconds(), host=host)
+    metrics.inc("http_requests_total", host=host, status=str(response.status_code))
+    metrics.inc("http_response_bytes_total", len(response.content or b""), host=host)
     response.raise_for_status()
     return response.json()
+
+
+def collect_pages(
+    fetch_page: Callable[[int], tuple[list, int]],
+    page_size: int,
+    max_results: int,
+    count_usable: Callable[[list], int],
+    max_pages: int,
+    max_workers: int = DEFAULT_PAGE_WORKERS,
+) -> list:
+    """Fetch pages, concurrently after the first, until ``max_results`` items are usable."""
+    items, total_pages = fetch_page(1)
+    items = list(items)
+    last_page = min(total_pages, max_pages)
+    next_page = 2
+
+    while next_page <= last_page:
+        missing = max_results - count_usable(items)
+        if missing <= 0:
+            break
+        wave_end = min(next_page + math.ceil(missing / page_size), last_page + 1)
+        wave = list(range(next_page, wave_end))
+        next_page = wave[-1] + 1
+        if len(wave) == 1:
+            pages = [fetch_page(wave[0])]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(wave))) as pool:
+                # Page threads inherit the fetch deadline from this context.
+                runs = [pool.submit(contextvars.copy_context().run, fetch_page, page) for page in wave]
+                pages = [run.result() for run in runs]
+        for page_items, _ in pages:
+            items.extend(page_items)
+    return items
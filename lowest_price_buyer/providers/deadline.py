@@ -0,0 +1,41 @@
+from __future__ import annotations
+
+import contextlib
+import contextvars
+import time
+from typing import Iterator
+
+# time.monotonic() by which the current provider fetch must finish.
+_deadline: contextvars.ContextVar[float | None] = contextvars.ContextVar("deadline", default=None)
+
+
+class DeadlineExceeded(TimeoutError):
+    pass
+
+
+@contextlib.contextmanager
+def deadline(at: float | None) -> Iterator[None]:
+    """Bound the blocking calls made in this context to finish by ``at``."""
+    current = _deadline.get()
+    if current is not None and (at is None or current < at):
+        at = current
+    token = _deadline.set(at)
+    try:
+        yield
+    finally:
+        _deadline.reset(token)
+
+
+def remaining() -> float | None:
+    at = _deadline.get()
+    return None if at is None else at - time.monotonic()
+
+
+def request_timeout(timeout: float | None) -> float | None:
+    """``timeout`` clamped to the time left before the deadline."""
+    left = remaining()
+    if left is None:
+        return timeout
+    if left <= 0:
+        raise DeadlineExceeded("provider deadline passed")
+    return left if timeout is None else min(timeout, left)
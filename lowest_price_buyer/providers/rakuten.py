@@ -3,32 +3,62 @@ from __future__ import annotations
 from typing import Any
 
 from lowest_price_buyer.models import Offer
-from lowest_price_buyer.providers.base import BaseProvider, ProviderError, fetch_json
+from lowest_price_buyer.providers.base import (
+    BaseProvider,
+    ProviderError,
+    collect_pages,
+    fetch_json,
+)
 
 
 ENDPOINT = "https://app.rakuten.co.jp/services/api/IchibaItem/Search/20220601"
+# Ichiba Item Search returns at most 30 hits per page and 100 pages.
+PAGE_SIZE = 30
+MAX_PAGES = 100
 
 
 class RakutenProvider(BaseProvider):
     name = "rakuten"
 
-    def __init__(self, app_id: str):
+    def __init__(self, app_id: str, **options: Any):
         if not app_id:
             raise ValueError("Rakuten app_id is required")
+        super().__init__(**options)
         self.app_id = app_id
 
-    def fetch(self, keyword: str, max_results: int = 5) -> list[Offer]:
-        payload = fetch_json(
-            ENDPOINT,
-            {
-                "format": "json",
-                "applicationId": self.app_id,
-                "keyword": keyword,
-                "hits": max_results,
-                "sort": "+itemPrice",
-            },
+    def fetch_raw(self, keyword: str, max_results: int = 5) -> dict[str, Any]:
+        page_size = max(min(max_results, PAGE_SIZE), 1)
+        total: dict[str, Any] = {}
+
+        def fetch_page(page: int) -> tuple[list, int]:
+            payload = fetch_json(
+                ENDPOINT,
+                {
+                    "format": "json",
+                    "applicationId": self.app_id,
+                    "keyword": keyword,
+                    "hits": page_size,
+                    "page": page,
+                    "sort": "+itemPrice",
+                },
+                timeout=self.request_timeout(),
+                session=self.session,
+            )
+            if page == 1:
+                total["count"] = payload.get("count")
+            return payload.get("Items", []), int(payload.get("pageCount") or 1)
+
+        items = collect_pages(
+            fetch_page,
+            page_size=page_size,
+            max_results=max_results,
+            count_usable=lambda items: _count_usable({"Items": items}, max_results),
+            max_pages=MAX_PAGES,
         )
-        return parse_rakuten_response(payload, max_results=max_results)
+        return {"Items": items, "count": total.get("count")}
+
+    def parse(self, raw: dict[str, Any], max_results: int = 5) -> list[Offer]:
+        return parse_rakuten_response(raw, max_results=max_results)
 
 
 def parse_rakuten_response(payload: dict[str, Any], max_results: int = 5) -> list[Offer]:
@@ -58,6 +88,7 @@ def parse_rakuten_response(payload: dict[str, Any], max_results: int = 5) -> lis
                 point_rate=point_rate,
                 point_amount_yen=None,
                 url=item.get("itemUrl"),
+                store=str(item["shopCode"]) if item.get("shopCode") else None,
             )
         )
         if len(offers) >= max_results:
@@ -68,6 +99,13 @@ def parse_rakuten_response(payload: dict[str, Any], max_results: int = 5) -> lis
     return offers
 
 
+def _count_usable(payload: dict[str, Any], max_results: int) -> int:
+    try:
+        return len(parse_rakuten_response(payload, max_results=max_results))
+    except ProviderError:
+        return 0
+
+
 def _to_float(value: Any) -> float | None:
     if value is None:
         return None
@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any
+
+from lowest_price_buyer.providers import deadline
+
+
+RETRY_STATUSES = frozenset({429, 503})
+DEFAULT_MAX_RETRIES = 2
+DEFAULT_BACKOFF = 0.5
+MAX_BACKOFF = 30.0
+
+
+class TokenBucket:
+    """Thread-safe token bucket; ``acquire`` blocks until a token is free."""
+
+    def __init__(self, rate: float, burst: float = 1.0):
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.burst = max(burst, 1.0)
+        self._tokens = self.burst
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, max_wait: float | None = None) -> float:
+        """Take one token and return the seconds spent waiting for it.
+
+        Raises ``DeadlineExceeded`` without taking a token when none would be
+        free within ``max_wait`` seconds.
+        """
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1.0:
+                    self._tokens -= 1.0
+                    return waited
+                delay = (1.0 - self._tokens) / self.rate
+            if max_wait is not None and waited + delay > max_wait:
+                raise deadline.DeadlineExceeded("no rate-limit token before the deadline")
+            time.sleep(delay)
+            waited += delay
+
+
+@dataclass
+class RateLimitStats:
+    requests: int = 0
+    throttled: int = 0
+    retried: int = 0
+    waited_seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["waited_seconds"] = round(self.waited_seconds, 3)
+        return data
+
+
+class RateLimiter:
+    """Per-provider request budget with retry on 429/503.
+
+    Requests take a token from an optional token bucket. Throttled responses
+    are retried up to ``max_retries`` times after the server's ``Retry-After``
+    delay, or an exponential backoff with full jitter when the header is absent.
+    Each throttle also halves the bucket rate (down to ``min_rate``) and every
+    successful request restores a little of it, so sustained load settles near
+    the quota the server actually grants.
+    """
+
+    def __init__(
+        self,
+        rate: float | None = None,
+        burst: float = 1.0,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        min_rate: float | None = None,
+    ):
+        self.bucket = TokenBucket(rate, burst) if rate else None
+        self.max_rate = rate
+        self.min_rate = min_rate if min_rate is not None else (rate / 8 if rate else None)
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.stats = RateLimitStats()
+        self._lock = threading.Lock()
+
+    def wrap(self, session: Any) -> LimitedSession:
+        return LimitedSession(session, self)
+
+    def request(self, session: Any, url: str, **kwargs: Any) -> Any:
+        attempt = 0
+        while True:
+            if self.bucket is not None:
+                waited = self.bucket.acquire(deadline.remaining())
+                with self._lock:
+                    self.stats.waited_seconds += waited
+            with self._lock:
+                self.stats.requests += 1
+
+            if "timeout" in kwargs:
+                kwargs["timeout"] = deadline.request_timeout(kwargs["timeout"])
+            response = session.get(url, **kwargs)
+            if response.status_code not in RETRY_STATUSES:
+                self._recover()
+                return response
+
+            with self._lock:
+                self.stats.throttled += 1
+            self._slow_down()
+            if attempt >= self.max_retries:
+                return response
+
+            delay = retry_after_seconds(response.headers.get("Retry-After"))
+            if delay is None:
+                delay = random.uniform(0, min(MAX_BACKOFF, self.backoff * 2**attempt))
+            delay = min(delay, MAX_BACKOFF)
+            left = deadline.remaining()
+            if left is not None and delay >= left:
+                return response  # the retry could not finish in time
+            response.close()
+            time.sleep(delay)
+            attempt += 1
+            with self._lock:
+                self.stats.retried += 1
+
+    def _slow_down(self) -> None:
+        if self.bucket is None:
+            return
+        with self._lock:
+            self.bucket.rate = max(self.min_rate, self.bucket.rate / 2)
+
+    def _recover(self) -> None:
+        if self.bucket is None or self.bucket.rate >= self.max_rate:
+            return
+        with self._lock:
+            self.bucket.rate = min(self.max_rate, self.bucket.rate + self.max_rate / 16)
+
+
+class LimitedSession:
+    """Session stand-in that routes ``get`` through a ``RateLimiter``."""
+
+    def __init__(self, session: Any, limiter: RateLimiter):
+        self.session = session
+        self.limiter = limiter
+
+    def get(self, url: str, **kwargs: Any) -> Any:
+        return self.limiter.request(self.session, url, **kwargs)
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.session, name)
+
+
+def retry_after_seconds(value: str | None) -> float | None:
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        moment = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return max((moment - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+def parse_rate_spec(spec: str) -> dict[str, tuple[float, float]]:
+    """Parse ``"yahoo=1,rakuten=1:3"`` into ``{provider: (rate, burst)}``."""
+    limits: dict[str, tuple[float, float]] = {}
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        provider, separator, value = part.partition("=")
+        if not separator:
+            raise ValueError(f"rate limit {part!r} must look like provider=rate[:burst]")
+        rate, _, burst = value.partition(":")
+        try:
+            limit = (float(rate), float(burst) if burst else 1.0)
+        except ValueError:
+            raise ValueError(f"rate limit {part!r} must look like provider=rate[:burst]") from None
+        if not (limit[0] > 0 and limit[1] > 0):
+            raise ValueError(f"rate limit {part!r} must have a positive rate and burst")
+        limits[provider.strip().lower()] = limit
+    return limits
@@ -0,0 +1,197 @@
+from __future__ import annotations
+
+import base64
+import gzip
+import json
+import random
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from lowest_price_buyer.providers.base import ProviderError
+
+if TYPE_CHECKING:
+    import requests
+
+
+# Credentials are neither part of the lookup key nor written to the archive.
+REDACTED_PARAMS = frozenset({"appid", "applicationId", "affiliateId"})
+# The archived body is already decoded, so these would describe it wrongly.
+DROPPED_HEADERS = frozenset(
+    {"content-encoding", "content-length", "transfer-encoding", "set-cookie"}
+)
+
+
+def request_key(url: str, params: dict | None) -> str:
+    kept = sorted((str(k), str(v)) for k, v in (params or {}).items() if k not in REDACTED_PARAMS)
+    return json.dumps([url, kept], ensure_ascii=False)
+
+
+class ResponseArchive:
+    """Recorded GET responses in a gzip-compressed NDJSON file.
+
+    Each record is written as its own gzip member as soon as it is captured,
+    so an interrupted recording keeps everything captured so far.
+    """
+
+    def __init__(self, path: Path | str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+
+    def append(self, url: str, params: dict | None, response: requests.Response) -> None:
+        record = {
+            "key": request_key(url, params),
+            "status": response.status_code,
+            "reason": response.reason,
+            "headers": {
+                name: value
+                for name, value in response.headers.items()
+                if name.lower() not in DROPPED_HEADERS
+            },
+            "encoding": response.encoding,
+            "elapsed": response.elapsed.total_seconds() if response.elapsed else 0.0,
+            "body": base64.b64encode(response.content or b"").decode("ascii"),
+        }
+        line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+        with self._lock:
+            with gzip.open(self.path, "ab") as out:
+                out.write(line)
+
+    def load(self) -> dict[str, list[dict]]:
+        records: dict[str, list[dict]] = {}
+        with gzip.open(self.path, "rt", encoding="utf-8") as stream:
+            for line in stream:
+                if line.strip():
+                    record = json.loads(line)
+                    records.setdefault(record["key"], []).append(record)
+        return records
+
+
+class RecordingSession:
+    """Session wrapper that archives every GET response it returns.
+
+    Bodies are read in full before they are archived, so streamed scraper
+    pages are recorded whole and the early stop applies again on replay.
+    """
+
+    def __init__(self, session: Any, archive: ResponseArchive):
+        self.session = session
+        self.archive = archive
+        self.recorded = 0
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: dict | None = None, **kwargs: Any) -> requests.Response:
+        response = self.session.get(url, params=params, **kwargs)
+        self.archive.append(url, params, response)
+        with self._lock:
+            self.recorded += 1
+        return response
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"recorded": self.recorded}
+
+    def __getattr__(self, name: str):
+        return getattr(self.session, name)
+
+
+class ReplaySession:
+    """Serve archived responses instead of touching the network.
+
+    ``latency`` is a ``(low, high)`` range in seconds slept before each
+    response, or ``None`` to replay each response's recorded latency.
+    ``error_rate`` is the fraction of requests answered with a ``503``
+    instead, which exercises the rate limiter's retries and the circuit
+    breaker. Requests that were not recorded raise ``ProviderError``.
+    Repeated recordings of one request are served in turn.
+    """
+
+    def __init__(
+        self,
+        archive: ResponseArchive,
+        latency: tuple[float, float] | None = (0.0, 0.0),
+        error_rate: float = 0.0,
+        seed: int | None = None,
+    ):
+        if not 0.0 <= error_rate <= 1.0:
+            raise ValueError("error_rate must be between 0 and 1")
+        self.records = archive.load()
+        self.latency = latency
+        self.error_rate = error_rate
+        self.served = 0
+        self.missed = 0
+        self.injected_errors = 0
+        self._turns: dict[str, int] = {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: dict | None = None, **kwargs: Any) -> requests.Response:
+        key = request_key(url, params)
+        record: dict = {}
+        with self._lock:
+            fail = self._random.random() < self.error_rate
+            recorded = self.records.get(key)
+            if recorded is None:
+                self.missed += 1
+            elif fail:
+                self.injected_errors += 1
+            else:
+                self.served += 1
+                turn = self._turns.get(key, 0)
+                self._turns[key] = turn + 1
+                record = recorded[turn % len(recorded)]
+            if self.latency is None:
+                delay = record.get("elapsed", 0.0)
+            else:
+                delay = self._random.uniform(*self.latency)
+        if delay > 0:
+            time.sleep(delay)
+        if recorded is None:
+            raise ProviderError(f"no recorded response for {url}")
+        if fail:
+            return build_response(url, params, {"status": 503, "reason": "Injected"}, delay)
+        return build_response(url, params, record, delay)
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {
+                "served": self.served,
+                "missed": self.missed,
+                "injected_errors": self.injected_errors,
+            }
+
+
+def build_response(
+    url: str, params: dict | None, record: dict, delay: float = 0.0
+) -> requests.Response:
+    """Rebuild a fully-read ``requests.Response`` from an archive record."""
+    import requests
+    from requests.structures import CaseInsensitiveDict
+
+    response = requests.Response()
+    response.status_code = record["status"]
+    response.reason = record.get("reason") or ""
+    response.headers = CaseInsensitiveDict(record.get("headers") or {})
+    response.encoding = record.get("encoding")
+    response._content = base64.b64decode(record.get("body", ""))
+    # Marks the body as read, so iter_content() slices _content for streamed callers.
+    response._content_consumed = True
+    response.url = requests.Request("GET", url, params=params).prepare().url
+    response.elapsed = timedelta(seconds=delay)
+    return response
+
+
+def parse_latency(value: str) -> tuple[float, float] | None:
+    """Parse ``"0.2"`` (fixed), ``"0.05:0.3"`` (uniform range) or ``"recorded"``."""
+    if value == "recorded":
+        return None
+    low, _, high = value.partition(":")
+    try:
+        bounds = (float(low), float(high or low))
+    except ValueError:
+        raise ValueError(f"invalid replay latency: {value!r}") from None
+    if bounds[0] < 0 or bounds[1] < bounds[0]:
+        raise ValueError(f"invalid replay latency: {value!r}")
+    return bounds
@@ -0,0 +1,55 @@
+from __future__ import annotations
+
+from abc import abstractmethod
+from typing import Any
+from urllib.parse import quote_plus
+
+from lowest_price_buyer.metrics import registry as metrics
+from lowest_price_buyer.models import Offer
+from lowest_price_buyer.providers.base import BaseProvider
+from lowest_price_buyer.providers.stream import read_until_enough
+
+
+USER_AGENT = (
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/122.0.0.0 Safari/537.36"
+)
+
+
+class ScraperProvider(BaseProvider):
+    """Provider that scrapes an HTML search page at ``search_url + quoted keyword``."""
+
+    search_url: str
+
+    def __init__(self, stream: bool = True, **options: Any):
+        super().__init__(**options)
+        self.stream = stream
+
+    def fetch_raw(self, keyword: str, max_results: int = 5) -> str:
+        return self.fetch_payload(keyword, max_results)[0]
+
+    def fetch_payload(self, keyword: str, max_results: int = 5) -> tuple[str, list[Offer] | None]:
+        response = self.session.get(
+            f"{self.search_url}{quote_plus(keyword)}",
+            headers={"User-Agent": USER_AGENT},
+            timeout=self.request_timeout(),
+            stream=self.stream,
+        )
+        try:
+            response.raise_for_status()
+        except Exception:
+            response.close()
+            raise
+        if not self.stream:
+            metrics.inc("payload_bytes_total", len(response.content), provider=self.name)
+            return response.text, None
+        # Stop downloading once the cards read so far yield max_results offers.
+        page = read_until_enough(response, self.card_key, self.parse, max_results)
+        metrics.inc("payload_bytes_total", page.bytes_read, provider=self.name)
+        return page.html, page.offers
+
+    @abstractmethod
+    def card_key(self, tag: str, attrs: list[tuple[str, Any]]) -> Any:
+        """Key of the result card that ``tag`` starts, or None."""
+        raise NotImplementedError
@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from contextlib import contextmanager
+from importlib.util import find_spec
+from typing import TYPE_CHECKING, Iterator
+
+if TYPE_CHECKING:
+    from bs4 import BeautifulSoup
+
+
+# Preferred first; html.parser ships with Python and is always available.
+BACKENDS = ("lxml", "html.parser")
+ENV_VAR = "LOWEST_PRICE_BUYER_HTML_PARSER"
+
+_configured: str | None = None
+_stats: dict[str, list[float]] = {}
+_stats_lock = threading.Lock()
+
+
+def available_backends() -> list[str]:
+    available = []
+    for backend in BACKENDS:
+        if backend == "html.parser" or _importable(backend):
+            available.append(backend)
+    return available
+
+
+def set_backend(backend: str | None) -> None:
+    """Force a parser backend, or pass ``None`` to pick the fastest available."""
+    global _configured
+    if backend is not None and backend not in available_backends():
+        raise ValueError(
+            f"HTML parser backend {backend!r} is not available; "
+            f"choose from {', '.join(available_backends())}"
+        )
+    _configured = backend
+
+
+def get_backend() -> str:
+    if _configured is not None:
+        return _configured
+    requested = os.getenv(ENV_VAR)
+    if requested and requested in available_backends():
+        return requested
+    return available_backends()[0]
+
+
+def make_soup(html: str, backend: str | None = None) -> BeautifulSoup:
+    from bs4 import BeautifulSoup
+
+    return BeautifulSoup(html, backend or get_backend())
+
+
+@contextmanager
+def timed_parse(name: str) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        elapsed = time.perf_counter() - started
+        with _stats_lock:
+            entry = _stats.setdefault(name, [0, 0.0])
+            entry[0] += 1
+            entry[1] += elapsed
+
+
+def parse_stats() -> dict[str, dict[str, float]]:
+    """Pages parsed and parse time per parser since the last reset."""
+    with _stats_lock:
+        return {
+            name: {
+                "pages": int(pages),
+                "total_ms": round(seconds * 1000, 3),
+                "avg_ms": round(seconds * 1000 / pages, 3) if pages else 0.0,
+            }
+            for name, (pages, seconds) in _stats.items()
+        }
+
+
+def reset_parse_stats() -> None:
+    with _stats_lock:
+        _stats.clear()
+
+
+def _importable(module: str) -> bool:
+    # find_spec locates the package without paying for importing it.
+    return find_spec(module) is not None
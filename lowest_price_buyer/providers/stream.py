@@ -0,0 +1,107 @@
+from __future__ import annotations
+
+import codecs
+from dataclasses import dataclass
+from html.parser import HTMLParser
+from typing import Any, Callable
+
+from lowest_price_buyer.models import Offer
+from lowest_price_buyer.providers.base import ProviderError
+
+
+CHUNK_SIZE = 16 * 1024
+
+# card_key(tag, attrs) returns a key when the tag starts a result card, else None.
+CardKey = Callable[[str, list[tuple[str, Any]]], Any]
+
+
+@dataclass
+class StreamedPage:
+    html: str
+    # Offers parsed from ``html`` when the download stopped early, else None.
+    offers: list[Offer] | None
+    bytes_read: int
+
+
+class CardBoundaryParser(HTMLParser):
+    """Event-based scanner that records where each result card starts.
+
+    Offsets are character positions in the concatenated input. A card is
+    known to be complete once the next card has started, so the text before
+    the last start offset can be parsed without truncating a card.
+    """
+
+    def __init__(self, card_key: CardKey):
+        super().__init__(convert_charrefs=False)
+        self.card_key = card_key
+        self.starts: list[int] = []
+        self._keys: set[Any] = set()
+        self._line_starts = [0]
+        self._fed = 0
+
+    def feed(self, data: str) -> None:
+        position = data.find("\n")
+        while position != -1:
+            self._line_starts.append(self._fed + position + 1)
+            position = data.find("\n", position + 1)
+        self._fed += len(data)
+        super().feed(data)
+
+    def handle_starttag(self, tag: str, attrs: list[tuple[str, Any]]) -> None:
+        key = self.card_key(tag, attrs)
+        if key is None or key in self._keys:
+            return
+        self._keys.add(key)
+        line, column = self.getpos()
+        self.starts.append(self._line_starts[line - 1] + column)
+
+
+def read_until_enough(
+    response: Any,
+    card_key: CardKey,
+    parse: Callable[[str, int], list[Offer]],
+    max_results: int,
+    chunk_size: int = CHUNK_SIZE,
+) -> StreamedPage:
+    """Read a streamed HTML response until ``max_results`` offers can be parsed.
+
+    The page holds either a prefix ending at a card boundary together with the
+    offers parsed from it (the connection is closed without reading the rest),
+    or the whole body.
+    """
+    decoder = codecs.getincrementaldecoder(response.encoding or "utf-8")(errors="replace")
+    scanner = CardBoundaryParser(card_key)
+    parts: list[str] = []
+    bytes_read = 0
+    attempt_at = max_results
+    try:
+        for data in response.iter_content(chunk_size=chunk_size):
+            bytes_read += len(data)
+            chunk = decoder.decode(data)
+            parts.append(chunk)
+            scanner.feed(chunk)
+            complete = len(scanner.starts) - 1
+            if complete < attempt_at:
+                continue
+
+            prefix = "".join(parts)[: scanner.starts[-1]]
+            try:
+                offers = parse(prefix, max_results)
+            except ProviderError:
+                offers = []
+            found = len(offers)
+            if found >= max_results:
+                return StreamedPage(prefix, offers, bytes_read)
+            # Some complete cards were unusable; wait for enough new ones.
+            attempt_at = complete + (max_results - found)
+    finally:
+        response.close()
+    parts.append(decoder.decode(b"", final=True))
+    return StreamedPage("".join(parts), None, bytes_read)
+
+
+def attr(attrs: list[tuple[str, Any]], name: str) -> str:
+    for key, value in attrs:
+        if key == name:
+            return value or ""
+    return ""
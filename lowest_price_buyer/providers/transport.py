@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import threading
+from typing import TYPE_CHECKING, Callable
+
+# requests is imported on first use so runs served entirely from the response
+# cache (or from manual offers) never pay for importing it.
+if TYPE_CHECKING:
+    import requests
+
+
+DEFAULT_POOL_CONNECTIONS = 8
+DEFAULT_POOL_MAXSIZE = 16
+
+_default_session: requests.Session | None = None
+_default_lock = threading.Lock()
+
+
+def build_session(
+    pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+    pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+) -> requests.Session:
+    """Create a keep-alive session with pooled connections per host.
+
+    ``pool_connections`` is the number of hosts whose pools are kept warm and
+    ``pool_maxsize`` the number of reusable connections per host, which should
+    be at least the number of threads that hit the same marketplace at once.
+    """
+    import requests
+    from requests.adapters import HTTPAdapter
+
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = accept_encoding()
+    session.headers["Connection"] = "keep-alive"
+    return session
+
+
+def get_session() -> requests.Session:
+    global _default_session
+    with _default_lock:
+        if _default_session is None:
+            _default_session = build_session()
+        return _default_session
+
+
+def accept_encoding() -> str:
+    # urllib3 only decodes brotli bodies when a brotli binding is installed.
+    for module in ("brotli", "brotlicffi"):
+        try:
+            __import__(module)
+        except ImportError:
+            continue
+        return "gzip, deflate, br"
+    return "gzip, deflate"
+
+
+class ConditionalSession:
+    """Session wrapper that revalidates repeated GETs with ETag/Last-Modified.
+
+    The body of each validated response is remembered per URL and query. Later
+    requests for the same resource send ``If-None-Match``/``If-Modified-Since``;
+    a ``304 Not Modified`` answer is turned back into the remembered ``200``
+    response so callers do not see the difference. Streamed requests are passed
+    through untouched because their bodies are never fully read.
+    """
+
+    def __init__(self, session: requests.Session):
+        self.session = session
+        self.not_modified = 0
+        self.revalidated = 0
+        self._entries: dict[tuple, tuple[dict[str, str], requests.Response]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, url: str, params: dict | None = None, **kwargs) -> requests.Response:
+        if kwargs.get("stream"):
+            return self.session.get(url, params=params, **kwargs)
+
+        key = (url, tuple(sorted((params or {}).items())))
+        with self._lock:
+            entry = self._entries.get(key)
+        headers = dict(kwargs.pop("headers", None) or {})
+        if entry is not None:
+            headers.update(entry[0])
+            with self._lock:
+                self.revalidated += 1
+
+        response = self.session.get(url, params=params, headers=headers, **kwargs)
+        if response.status_code == 304 and entry is not None:
+            with self._lock:
+                self.not_modified += 1
+            return _copy_response(entry[1])
+
+        validators = {}
+        if response.headers.get("ETag"):
+            validators["If-None-Match"] = response.headers["ETag"]
+        if response.headers.get("Last-Modified"):
+            validators["If-Modified-Since"] = response.headers["Last-Modified"]
+        if response.status_code == 200 and validators:
+            response.content  # read the body so it can be replayed later
+            with self._lock:
+                self._entries[key] = (validators, response)
+        return response
+
+    def stats(self) -> dict[str, int]:
+        with self._lock:
+            return {"revalidated": self.revalidated, "not_modified": self.not_modified}
+
+    def __getattr__(self, name: str):
+        return getattr(self.session, name)
+
+
+def _copy_response(original: requests.Response) -> requests.Response:
+    import requests
+
+    response = requests.Response()
+    response.status_code = original.status_code
+    response.headers = original.headers.copy()
+    response._content = original.content
+    response.encoding = original.encoding
+    response.url = original.url
+    response.reason = original.reason
+    return response
+
+
+class LazySession:
+    """Session placeholder that builds the real session on first use."""
+
+    def __init__(self, factory: Callable[[], requests.Session]):
+        self._factory = factory
+        self._session: requests.Session | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._factory()
+        return self._session
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.session.get(url, **kwargs)
+
+    def __getattr__(self, name: str):
+        return getattr(self.session, name)
@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+import multiprocessing
+from concurrent.futures import Executor, ProcessPoolExecutor, TimeoutError as FutureTimeout
+from typing import Any, Callable
+
+from lowest_price_buyer.models import Offer
+from lowest_price_buyer.providers import deadline
+
+# parse(raw, max_results) -> offers; must be a module-level function so it pickles.
+ParseFn = Callable[[Any, int], list[Offer]]
+
+
+def create_parse_pool(workers: int, backend: str | None = None) -> ProcessPoolExecutor:
+    """Process pool for CPU-bound HTML parsing.
+
+    Workers are spawned rather than forked because the parent already runs
+    provider threads, and each worker is set to the parent's HTML backend.
+    """
+    return ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(backend,),
+    )
+
+
+def parse_in_pool(executor: Executor, parse: ParseFn, raw: Any, max_results: int) -> list[Offer]:
+    """Run ``parse`` in ``executor`` and rebuild the offers from plain tuples.
+
+    Waits at most until the fetch deadline, so a backed-up pool cannot hold
+    the provider past it.
+    """
+    future = executor.submit(_parse_to_rows, parse, raw, max_results)
+    try:
+        rows = future.result(timeout=deadline.remaining())
+    except FutureTimeout:
+        future.cancel()
+        raise deadline.DeadlineExceeded("parse did not finish before the deadline") from None
+    return [Offer(*row) for row in rows]
+
+
+def _init_worker(backend: str | None) -> None:
+    from lowest_price_buyer.providers.soup import set_backend
+
+    set_backend(backend)
+
+
+def _parse_to_rows(parse: ParseFn, raw: Any, max_results: int) -> list[tuple]:
+    # Tuples pickle smaller and faster than dataclass instances.
+    return [
+        (
+            offer.provider,
+            offer.title,
+            offer.price_yen,
+            offer.shipping_yen,
+            offer.point_rate,
+            offer.point_amount_yen,
+            offer.url,
+            offer.store,
+        )
+        for offer in parse(raw, max_results)
+    ]
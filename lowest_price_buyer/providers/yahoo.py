@@ -1,32 +1,64 @@
 from __future__ import annotations
 
+import math
 from typing import Any
 
 from lowest_price_buyer.models import Offer
-from lowest_price_buyer.providers.base import BaseProvider, ProviderError, fetch_json
+from lowest_price_buyer.providers.base import (
+    BaseProvider,
+    ProviderError,
+    collect_pages,
+    fetch_json,
+)
 
 
 ENDPOINT = "https://shopping.yahooapis.jp/ShoppingWebService/V3/itemSearch"
+# itemSearch returns at most 100 results per request and 1000 in total.
+PAGE_SIZE = 100
+MAX_RESULTS_WINDOW = 1000
 
 
 class YahooShoppingProvider(BaseProvider):
     name = "yahoo"
 
-    def __init__(self, app_id: str):
+    def __init__(self, app_id: str, **options: Any):
         if not app_id:
             raise ValueError("Yahoo Shopping app_id is required")
+        super().__init__(**options)
         self.app_id = app_id
 
-    def fetch(self, keyword: str, max_results: int = 5) -> list[Offer]:
-        payload = fetch_json(
-            ENDPOINT,
-            {
-                "appid": self.app_id,
-                "query": keyword,
-                "results": max_results,
-            },
+    def fetch_raw(self, keyword: str, max_results: int = 5) -> dict[str, Any]:
+        page_size = max(min(max_results, PAGE_SIZE), 1)
+        total: dict[str, Any] = {}
+
+        def fetch_page(page: int) -> tuple[list, int]:
+            payload = fetch_json(
+                ENDPOINT,
+                {
+                    "appid": self.app_id,
+                    "query": keyword,
+                    "results": page_size,
+                    "start": (page - 1) * page_size + 1,
+                },
+                timeout=self.request_timeout(),
+                session=self.session,
+            )
+            available = _extract_int(payload.get("totalResultsAvailable")) or 0
+            if page == 1:
+                total["totalResultsAvailable"] = available
+            return payload.get("hits", []), math.ceil(available / page_size)
+
+        hits = collect_pages(
+            fetch_page,
+            page_size=page_size,
+            max_results=max_results,
+            count_usable=lambda hits: _count_usable({"hits": hits}, max_results),
+            max_pages=MAX_RESULTS_WINDOW // page_size,
         )
-        return parse_yahoo_response(payload, max_results=max_results)
+        return {"hits": hits, "totalResultsAvailable": total.get("totalResultsAvailable")}
+
+    def parse(self, raw: dict[str, Any], max_results: int = 5) -> list[Offer]:
+        return parse_yahoo_response(raw, max_results=max_results)
 
 
 def parse_yahoo_response(payload: dict[str, Any], max_results: int = 5) -> list[Offer]:
@@ -55,6 +87,7 @@ def parse_yahoo_response(payload: dict[str, Any], max_results: int = 5) -> list[
                 point_rate=point_rate,
                 point_amount_yen=point_amount,
                 url=item.get("url"),
+                store=_extract_seller(item.get("seller")),
             )
         )
         if len(offers) >= max_results:
@@ -65,6 +98,13 @@ def parse_yahoo_response(payload: dict[str, Any], max_results: int = 5) -> list[
     return offers
 
 
+def _count_usable(payload: dict[str, Any], max_results: int) -> int:
+    try:
+        return len(parse_yahoo_response(payload, max_results=max_results))
+    except ProviderError:
+        return 0
+
+
 def _extract_int(value: Any) -> int | None:
     if isinstance(value, dict):
         for key in ("value", "amount", "price"):
@@ -77,6 +117,12 @@ def _extract_int(value: Any) -> int | None:
         return None
 
 
+def _extract_seller(value: Any) -> str | None:
+    if isinstance(value, dict) and value.get("sellerId"):
+        return str(value["sellerId"])
+    return None
+
+
 def _extract_shipping(value: Any) -> int:
     if isinstance(value, dict):
         for key in ("fee", "price", "amount"):
@@ -1,39 +1,52 @@
 from __future__ import annotations
 
 import re
-from urllib.parse import quote_plus, urljoin
-
-import requests
-from bs4 import BeautifulSoup
+from typing import TYPE_CHECKING, Any
+from urllib.parse import urljoin
 
 from lowest_price_buyer.models import Offer
-from lowest_price_buyer.providers.base import BaseProvider, ProviderError
+from lowest_price_buyer.providers.base import ProviderError
+from lowest_price_buyer.providers.scraper import ScraperProvider
+from lowest_price_buyer.providers.soup import make_soup, timed_parse
+from lowest_price_buyer.providers.stream import attr
+
+if TYPE_CHECKING:
+    from bs4.element import Tag
 
 
 SEARCH_URL = "https://www.yodobashi.com/?word="
-USER_AGENT = (
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-    "AppleWebKit/537.36 (KHTML, like Gecko) "
-    "Chrome/122.0.0.0 Safari/537.36"
-)
+PRICE_PATTERN = re.compile(r"([0-9][0-9,]*)\s*円")
+POINTS_PATTERN = re.compile(r"([0-9][0-9,]*)\s*ポイント")
+RATE_PATTERN = re.compile(r"([0-9]{1,2})\s*%\s*還元")
 
 
-class YodobashiProvider(BaseProvider):
+class YodobashiProvider(ScraperProvider):
     name = "yodobashi"
+    search_url = SEARCH_URL
 
-    def fetch(self, keyword: str, max_results: int = 5) -> list[Offer]:
-        url = f"{SEARCH_URL}{quote_plus(keyword)}"
-        response = requests.get(url, headers={"User-Agent": USER_AGENT}, timeout=20)
-        response.raise_for_status()
-        return parse_yodobashi_html(response.text, max_results=max_results)
+    def card_key(self, tag: str, attrs: list[tuple[str, Any]]) -> str | None:
+        return _card_key(tag, attrs)
+
+    def parse(self, raw: str, max_results: int = 5) -> list[Offer]:
+        return self.run_parse(parse_yodobashi_html, raw, max_results)
 
 
 def parse_yodobashi_html(html: str, max_results: int = 5) -> list[Offer]:
-    soup = BeautifulSoup(html, "html.parser")
+    with timed_parse("yodobashi"):
+        return _parse_yodobashi_html(html, max_results)
+
+
+def _parse_yodobashi_html(html: str, max_results: int) -> list[Offer]:
+    import soupsieve
+
+    soup = make_soup(html)
     offers: list[Offer] = []
     seen_urls: set[str] = set()
+    # Product cards hold several links to the same item; scan each card once.
+    card_cache: dict[int, tuple[int | None, int | None, float | None]] = {}
 
-    for link in soup.select("a[href*='/product/']"):
+    # iselect walks the tree lazily, so we stop as soon as enough items are found.
+    for link in soupsieve.iselect("a[href*='/product/']", soup):
         href = link.get("href")
         if not href:
             continue
@@ -41,22 +54,19 @@ def parse_yodobashi_html(html: str, max_results: int = 5) -> list[Offer]:
         if url in seen_urls:
             continue
 
-        container = link.find_parent(["li", "div", "article"]) or link
-        text = container.get_text(" ", strip=True)
         title = link.get_text(" ", strip=True)
         if not title:
             continue
 
-        price = _extract_first_int(r"([0-9][0-9,]*)\s*円", text)
+        container = link.find_parent(["li", "div", "article"]) or link
+        card = card_cache.get(id(container))
+        if card is None:
+            card = _scan_card(container)
+            card_cache[id(container)] = card
+        price, points, point_rate = card
         if price is None:
             continue
 
-        points = _extract_first_int(r"([0-9][0-9,]*)\s*ポイント", text)
-        point_rate = None
-        if points is None:
-            raw_rate = _extract_first_int(r"([0-9]{1,2})\s*%\s*還元", text)
-            point_rate = float(raw_rate) if raw_rate is not None else None
-
         offers.append(
             Offer(
                 provider="yodobashi",
@@ -77,8 +87,31 @@ def parse_yodobashi_html(html: str, max_results: int = 5) -> list[Offer]:
     return offers
 
 
-def _extract_first_int(pattern: str, text: str) -> int | None:
-    match = re.search(pattern, text)
+def _scan_card(container: Tag) -> tuple[int | None, int | None, float | None]:
+    text = container.get_text(" ", strip=True)
+    price = _extract_first_int(PRICE_PATTERN, text)
+    if price is None:
+        return None, None, None
+
+    points = _extract_first_int(POINTS_PATTERN, text)
+    point_rate = None
+    if points is None:
+        raw_rate = _extract_first_int(RATE_PATTERN, text)
+        point_rate = float(raw_rate) if raw_rate is not None else None
+    return price, points, point_rate
+
+
+def _extract_first_int(pattern: re.Pattern[str], text: str) -> int | None:
+    match = pattern.search(text)
     if not match:
         return None
     return int(match.group(1).replace(",", ""))
+
+
+def _card_key(tag: str, attrs: list[tuple[str, Any]]) -> str | None:
+    if tag != "a":
+        return None
+    href = attr(attrs, "href")
+    if "/product/" not in href:
+        return None
+    return urljoin("https://www.yodobashi.com", href)
@@ -0,0 +1,136 @@
+from __future__ import annotations
+
+import json
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable
+from urllib.parse import parse_qs, urlsplit
+
+from .metrics import registry as metrics
+
+
+# search(keyword, params) -> JSON-serializable record
+SearchFn = Callable[[str, dict[str, str]], dict[str, Any]]
+
+
+class LatencyStats:
+    def __init__(self) -> None:
+        self.requests = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, elapsed_ms: float) -> None:
+        with self._lock:
+            self.requests += 1
+            self.total_ms += elapsed_ms
+            self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def as_dict(self) -> dict[str, float]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "avg_ms": round(self.total_ms / self.requests, 3) if self.requests else 0.0,
+                "max_ms": round(self.max_ms, 3),
+            }
+
+
+class SearchServer(ThreadingHTTPServer):
+    """HTTP/JSON front end that keeps providers, pools and caches warm.
+
+    ``GET /search?keyword=...`` returns the same ranking as the CLI; optional
+    ``max_results`` and ``top`` query parameters override the server defaults.
+    ``GET /stats`` reports request latency, ``GET /metrics`` exposes per-stage
+    metrics in the Prometheus text format and ``GET /healthz`` liveness.
+    """
+
+    daemon_threads = True
+
+    def __init__(self, address: tuple[str, int], search: SearchFn, quiet: bool = False):
+        super().__init__(address, _Handler)
+        self.search = search
+        self.quiet = quiet
+        self.latency = LatencyStats()
+        self.extra_stats: dict[str, Callable[[], Any]] = {}
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server: SearchServer
+
+    def do_GET(self) -> None:
+        started = time.perf_counter()
+        url = urlsplit(self.path)
+        if url.path == "/healthz":
+            self._send(200, {"status": "ok"})
+            return
+        if url.path == "/stats":
+            stats = {"latency": self.server.latency.as_dict()}
+            stats.update({name: fn() for name, fn in self.server.extra_stats.items()})
+            self._send(200, stats)
+            return
+        if url.path == "/metrics":
+            data = metrics.to_prometheus().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+            return
+        if url.path != "/search":
+            self._send(404, {"error": f"unknown path {url.path}"})
+            return
+
+        params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+        keyword = params.pop("keyword", "").strip()
+        if not keyword:
+            self._send(400, {"error": "keyword is required"})
+            return
+
+        try:
+            record = self.server.search(keyword, params)
+        except ValueError as exc:
+            self._send(400, {"error": str(exc)})
+            return
+
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        self.server.latency.record(elapsed_ms)
+        metrics.observe("request_seconds", elapsed_ms / 1000)
+        record["latency_ms"] = round(elapsed_ms, 3)
+        self._send(200, record, elapsed_ms)
+
+    def _send(self, status: int, body: dict[str, Any], elapsed_ms: float | None = None) -> None:
+        data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(data)))
+        if elapsed_ms is not None:
+            self.send_header("Server-Timing", f"total;dur={elapsed_ms:.1f}")
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format: str, *args: Any) -> None:
+        if not self.server.quiet:
+            sys.stderr.write(f"[serve] {self.address_string()} {format % args}\n")
+
+
+def parse_address(value: str) -> tuple[str, int]:
+    """Parse ``PORT`` or ``HOST:PORT``; the host defaults to 127.0.0.1."""
+    host, separator, port = value.rpartition(":")
+    if not separator:
+        host = "127.0.0.1"
+    return host or "127.0.0.1", int(port)
+
+
+def serve(address: tuple[str, int], search: SearchFn, **extra_stats: Callable[[], Any]) -> None:
+    server = SearchServer(address, search)
+    server.extra_stats.update(extra_stats)
+    host, port = server.server_address[:2]
+    print(f"[serve] listening on http://{host}:{port}", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
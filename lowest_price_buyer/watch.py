@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import heapq
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable
+
+
+# search(keyword) -> (ranked rows as printed by --as-json, {provider: error})
+SearchFn = Callable[[str], tuple[list[dict], dict[str, str]]]
+EmitFn = Callable[[dict], None]
+
+
+def offer_key(row: dict) -> tuple[str, str]:
+    return row["provider"], row["url"] or row["title"]
+
+
+def diff_rankings(keyword: str, previous: list[dict] | None, current: list[dict]) -> dict | None:
+    """Describe what changed between two rankings, or ``None`` if nothing did.
+
+    Offers are matched by provider and URL (title when there is no URL). The
+    result lists added, removed and re-priced offers and flags a new lowest
+    effective price.
+    """
+    before = {offer_key(row): row for row in previous or []}
+    after = {offer_key(row): row for row in current}
+
+    added = [row for key, row in after.items() if key not in before]
+    removed = [row for key, row in before.items() if key not in after]
+    changed = [
+        {"before": before[key], "after": row}
+        for key, row in after.items()
+        if key in before and _price(before[key]) != _price(row)
+    ]
+
+    lowest = current[0] if current else None
+    previous_lowest = previous[0]["effective_yen"] if previous else None
+    new_lowest = lowest is not None and (
+        previous_lowest is None or lowest["effective_yen"] < previous_lowest
+    )
+    if not (added or removed or changed or new_lowest):
+        return None
+    return {
+        "keyword": keyword,
+        "new_lowest": new_lowest,
+        "lowest": lowest,
+        "added": added,
+        "removed": removed,
+        "changed": changed,
+    }
+
+
+def _price(row: dict) -> tuple[int, int, int]:
+    return row["gross_yen"], row["points_yen"], row["effective_yen"]
+
+
+def _rank(row: dict) -> tuple[int, int, str]:
+    return row["effective_yen"], row["gross_yen"], row["provider"]
+
+
+def watch(
+    keywords: list[str],
+    search: SearchFn,
+    emit: EmitFn,
+    interval: float,
+    concurrency: int = 4,
+    rounds: int | None = None,
+    limit: int | None = None,
+    clock: Callable[[], float] = time.monotonic,
+    sleep: Callable[[float], None] = time.sleep,
+) -> None:
+    """Poll every keyword each ``interval`` seconds and emit only changes.
+
+    Polls are spread evenly over the interval (keyword ``i`` of ``n`` first
+    runs at ``i * interval / n``) so the marketplaces see a steady trickle
+    instead of a burst. The last ranking per keyword is kept in memory and
+    ``emit`` is called with ``diff_rankings`` output only when something
+    changed. Providers that failed keep their previous offers, and their
+    errors are emitted when they differ from the keyword's previous poll.
+    ``limit`` caps the kept ranking like ``--top``. A keyword is not polled
+    again until its previous poll has finished. ``rounds`` limits how many
+    times each keyword is polled.
+    """
+    if not keywords:
+        return
+
+    started = clock()
+    step = interval / len(keywords)
+    schedule = [(started + index * step, index, 0) for index in range(len(keywords))]
+    heapq.heapify(schedule)
+    last: dict[str, list[dict]] = {}
+    last_errors: dict[str, dict[str, str]] = {}
+    in_flight: dict[int, Future] = {}
+    emit_lock = threading.Lock()
+
+    def poll(keyword: str) -> None:
+        try:
+            current, errors = search(keyword)
+        except Exception as exc:
+            with emit_lock:
+                emit({"keyword": keyword, "error": str(exc)})
+            return
+        with emit_lock:
+            previous = last.get(keyword)
+            if errors and errors != last_errors.get(keyword):
+                emit({"keyword": keyword, "errors": errors})
+            last_errors[keyword] = errors
+            if errors:
+                kept = [row for row in previous or [] if row["provider"] in errors]
+                current = sorted(current + kept, key=_rank)[:limit]
+            change = diff_rankings(keyword, previous, current)
+            last[keyword] = current
+            if change is not None:
+                emit(change)
+
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="watch") as pool:
+        while schedule:
+            due, index, round_number = heapq.heappop(schedule)
+            delay = due - clock()
+            if delay > 0:
+                sleep(delay)
+            # Slow polls delay the next round instead of piling up in the pool.
+            if index in in_flight:
+                wait([in_flight[index]])
+            in_flight[index] = pool.submit(poll, keywords[index])
+            if rounds is None or round_number + 1 < rounds:
+                heapq.heappush(schedule, (due + interval, index, round_number + 1))
@@ -0,0 +1,29 @@
+import threading
+import time
+
+from lowest_price_buyer.models import Offer
+from lowest_price_buyer.providers.base import BaseProvider, ProviderError
+
+
+class StubProvider(BaseProvider):
+    """Provider whose download sleeps ``delay``, fails with ``error`` and counts ``calls``."""
+
+    def __init__(self, name="stub", delay=0.0, error=None, offers=1, **options):
+        super().__init__(**options)
+        self.name = name
+        self.delay = delay
+        self.error = error
+        self.offers = offers
+        self.calls = 0
+        self._lock = threading.Lock()
+
+    def fetch_raw(self, keyword, max_results=5):
+        with self._lock:
+            self.calls += 1
+        time.sleep(self.delay)
+        if self.error:
+            raise ProviderError(self.error)
+        return keyword
+
+    def parse(self, raw, max_results=5):
+        return [Offer(provider=self.name, title=raw, price_yen=1000)] * self.offers
@@ -0,0 +1,40 @@
+import io
+import threading
+import time
+
+from lowest_price_buyer.batch import iter_keywords, run_batch
+
+
+def test_iter_keywords_skips_blank_lines_and_comments():
+    stream = io.StringIO("switch\n\n# comment\n  HAC-001  \n")
+
+    assert list(iter_keywords(stream)) == ["switch", "HAC-001"]
+
+
+def test_run_batch_bounds_in_flight_keywords_and_streams_results():
+    lock = threading.Lock()
+    active = 0
+    peak = 0
+
+    def search(keyword):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.3 if keyword == "slow" else 0.01)
+        with lock:
+            active -= 1
+        return keyword.upper()
+
+    consumed = []
+
+    def keywords():
+        for keyword in ["slow", "a", "b", "c", "d", "e"]:
+            consumed.append(keyword)
+            yield keyword
+
+    results = list(run_batch(keywords(), search, concurrency=2))
+
+    assert peak <= 2
+    assert sorted(results) == sorted((k, k.upper()) for k in consumed)
+    assert results[-1] == ("slow", "SLOW")
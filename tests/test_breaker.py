@@ -0,0 +1,56 @@
+import time
+
+import pytest
+
+from conftest import StubProvider
+from lowest_price_buyer.providers.base import ProviderError
+from lowest_price_buyer.providers.breaker import (
+    CLOSED,
+    HALF_OPEN,
+    OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+)
+
+
+def test_breaker_opens_after_threshold_and_skips_provider():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=60)
+    provider = StubProvider("flaky", error="down", breaker=breaker)
+
+    for _ in range(2):
+        with pytest.raises(ProviderError):
+            provider.fetch("switch")
+    assert provider.breaker.state == OPEN
+
+    with pytest.raises(CircuitOpenError):
+        provider.fetch("switch")
+    assert provider.calls == 2
+    assert provider.breaker.rejected == 1
+
+
+def test_breaker_half_open_probe_closes_or_reopens_circuit():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.05)
+    provider = StubProvider("flaky", error="down", breaker=breaker)
+
+    with pytest.raises(ProviderError):
+        provider.fetch("switch")
+    time.sleep(0.06)
+    assert provider.breaker.state == HALF_OPEN
+
+    with pytest.raises(ProviderError):
+        provider.fetch("switch")
+    assert provider.breaker.state == OPEN
+
+    time.sleep(0.06)
+    provider.error = None
+    assert provider.fetch("switch")[0].title == "switch"
+    assert provider.breaker.state == CLOSED
+
+
+def test_half_open_lets_only_one_probe_through():
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0)
+    breaker.record_failure()
+
+    breaker.before_call()
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
@@ -0,0 +1,55 @@
+import os
+import time
+
+import pytest
+
+from conftest import StubProvider
+from lowest_price_buyer.cache import ResponseCache, parse_ttl_spec
+
+
+def test_cache_hit_skips_network_and_reparses_raw_payload(tmp_path):
+    cache = ResponseCache(tmp_path)
+    provider = StubProvider("counting", cache=cache)
+
+    first = provider.fetch("switch", max_results=5)
+    second = provider.fetch("switch", max_results=5)
+    provider.fetch("switch", max_results=10)
+
+    assert first == second
+    assert provider.calls == 2
+    assert cache.stats.hits == 1
+    assert cache.stats.misses == 2
+    assert cache.stats.stores == 2
+
+
+def test_cache_entries_expire_per_provider_ttl(tmp_path):
+    cache = ResponseCache(tmp_path, default_ttl=600, ttl={"amazon": 0})
+    cache.put("amazon", "switch", 5, "<html></html>")
+    cache.put("yahoo", "switch", 5, {"hits": []})
+    time.sleep(0.01)
+
+    assert cache.get("amazon", "switch", 5) is None
+    assert cache.get("yahoo", "switch", 5) == {"hits": []}
+    assert cache.stats.expired == 1
+
+
+def test_cache_evicts_least_recently_used_entries(tmp_path):
+    payload = os.urandom(2048).hex()
+    cache = ResponseCache(tmp_path, max_bytes=5000)
+    cache.put("amazon", "a", 5, payload)
+    time.sleep(0.01)
+    cache.put("amazon", "b", 5, payload)
+    time.sleep(0.01)
+    assert cache.get("amazon", "a", 5) == payload
+    cache.put("amazon", "c", 5, payload)
+
+    assert cache.get("amazon", "b", 5) is None
+    assert cache.get("amazon", "a", 5) == payload
+    assert cache.stats.evictions == 1
+    assert cache.total_bytes <= 5000
+
+
+def test_parse_ttl_spec():
+    assert parse_ttl_spec("120,amazon=30, Yahoo=60") == (120.0, {"amazon": 30.0, "yahoo": 60.0})
+    with pytest.raises(ValueError):
+        parse_ttl_spec("abc")
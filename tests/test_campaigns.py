@@ -0,0 +1,81 @@
+import datetime as dt
+import json
+import random
+
+import pytest
+
+from lowest_price_buyer.campaigns import CampaignBook, CampaignRule, load_campaigns
+from lowest_price_buyer.columnar import OfferBatch
+from lowest_price_buyer.comparator import TopKRanker, evaluate_offers
+from lowest_price_buyer.models import Offer
+
+DAY = dt.date(2026, 10, 5)
+
+
+def _rules():
+    return [
+        CampaignRule("spu", "rakuten", rate=7, cap_yen=300),
+        CampaignRule("five-day", "rakuten", rate=4, days=frozenset({5, 10})),
+        CampaignRule("shop bonus", "rakuten", store="shop-a", bonus_yen=500, min_gross_yen=5000),
+        CampaignRule("ended", "yahoo", rate=50, end=dt.date(2026, 9, 30)),
+    ]
+
+
+def test_rules_stack_per_store_with_caps_and_dates():
+    book = CampaignBook(_rules())
+    offers = [
+        Offer("rakuten", "A", 10000, store="shop-a"),
+        Offer("rakuten", "B", 10000, store="shop-b"),
+        Offer("rakuten", "C", 4000, store="shop-a"),
+        Offer("yahoo", "D", 10000),
+        Offer("amazon", "E", 10000),
+    ]
+
+    # spu capped at 300, five-day 400, shop bonus only above 5000 yen.
+    assert book.bonus_points(offers, DAY) == [1200, 700, 280 + 160, 0, 0]
+    assert book.bonus_points(offers, DAY + dt.timedelta(days=1)) == [800, 300, 280, 0, 0]
+    assert book.bonus_points(offers[3:4], dt.date(2026, 9, 1)) == [5000]
+
+
+def test_bulk_paths_agree_with_per_offer_evaluation():
+    rng = random.Random(5)
+    offers = [
+        Offer(
+            provider=rng.choice(["rakuten", "yahoo", "amazon"]),
+            title=f"Offer {index}",
+            price_yen=rng.randint(100, 30000),
+            point_rate=rng.choice([None, 1.0, 10.0]),
+            store=rng.choice([None, "shop-a", "shop-b"]),
+        )
+        for index in range(500)
+    ]
+    book = CampaignBook(_rules())
+    ranked = evaluate_offers(offers, campaigns=book)
+    bonuses = dict(zip(map(id, offers), book.bonus_points(offers)))
+
+    for item in ranked:
+        plain = evaluate_offers([item.offer])[0]
+        assert item.earned_points_yen == plain.earned_points_yen + bonuses[id(item.offer)]
+    ranker = TopKRanker(10, book)
+    ranker.extend(offers[:250])
+    ranker.extend(offers[250:])
+    assert ranker.results() == ranked[:10]
+    assert OfferBatch.from_offers(offers).rank(campaigns=book) == ranked
+
+
+def test_load_campaigns_validates_rules(tmp_path):
+    path = tmp_path / "campaigns.json"
+    path.write_text(
+        json.dumps(
+            {"rules": [{"provider": "rakuten", "store": "shop-a", "rate": 2, "start": "2026-10-01"}]}
+        ),
+        encoding="utf-8",
+    )
+    book = load_campaigns(path)
+    assert len(book) == 1
+    assert book.bonus_points([Offer("rakuten", "A", 1000, store="shop-a")], DAY) == [20]
+
+    path.write_text(json.dumps([{"provider": "rakuten", "rate": 2, "cap": 10}]), encoding="utf-8")
+    with pytest.raises(ValueError, match="cap"):
+        load_campaigns(path)
+
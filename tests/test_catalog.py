@@ -0,0 +1,64 @@
+import io
+import json
+
+from lowest_price_buyer.catalog import Catalog, compile_catalog, is_catalog, iter_offer_dicts
+from lowest_price_buyer.cli import main
+
+
+OFFERS = [
+    {"provider": "manual", "title": "Nintendo Switch 本体 HAC-001", "price_yen": 30000},
+    {"provider": "manual", "title": "Ｎｉｎｔｅｎｄｏ Ｓｗｉｔｃｈ本体 ＨＡＣ００１", "price_yen": 29500},
+    {"provider": "manual", "title": "ソニー WH-1000XM5 ブラック", "price_yen": 41000},
+]
+
+
+def test_iter_offer_dicts_streams_json_arrays_and_ndjson():
+    array_text = json.dumps([OFFERS[0], 1, OFFERS[1], OFFERS[2]], ensure_ascii=False, indent=2)
+    ndjson_text = "\n".join(json.dumps(item, ensure_ascii=False) for item in OFFERS) + "\n\n"
+
+    # A tiny chunk size forces every element to straddle buffer refills.
+    assert list(iter_offer_dicts(io.StringIO(array_text), chunk_size=7)) == OFFERS
+    assert list(iter_offer_dicts(io.StringIO(ndjson_text), chunk_size=7)) == OFFERS
+    assert list(iter_offer_dicts(io.StringIO(" [ ] "))) == []
+
+
+def test_compiled_catalog_returns_only_offers_matching_the_keyword(tmp_path):
+    source = tmp_path / "offers.json"
+    source.write_text(json.dumps(OFFERS, ensure_ascii=False), encoding="utf-8")
+    target = tmp_path / "offers.lpbc"
+
+    assert compile_catalog(source, target) == 3
+    assert is_catalog(target) and not is_catalog(source)
+    with Catalog(target) as catalog:
+        assert len(catalog) == 3
+        assert [o.price_yen for o in catalog.lookup("switch hac-001 本体")] == [30000, 29500]
+        assert [o.title for o in catalog.lookup("WH1000XM5")] == [OFFERS[2]["title"]]
+        assert catalog.lookup("PlayStation") == []
+
+
+def test_catalog_lookup_applies_single_character_words(tmp_path):
+    source = tmp_path / "offers.json"
+    offers = OFFERS + [{"provider": "manual", "title": "Nintendo Switch 2 本体", "price_yen": 49980}]
+    source.write_text(json.dumps(offers, ensure_ascii=False), encoding="utf-8")
+    target = tmp_path / "offers.lpbc"
+    compile_catalog(source, target)
+
+    with Catalog(target) as catalog:
+        assert [o.price_yen for o in catalog.lookup("Switch 2")] == [49980]
+        assert [o.price_yen for o in catalog.lookup("体")] == [30000, 29500, 49980]
+        assert catalog.lookup("Switch 3") == []
+
+
+def test_cli_merges_catalog_offers_for_the_keyword(tmp_path, capsys):
+    source = tmp_path / "offers.ndjson"
+    source.write_text(
+        "\n".join(json.dumps(item, ensure_ascii=False) for item in OFFERS), encoding="utf-8"
+    )
+    target = tmp_path / "offers.lpbc"
+    assert main(["catalog", str(source), str(target)]) == 0
+    capsys.readouterr()
+
+    main(["WH-1000XM5", "--providers", "", "--manual-offers", str(target), "--as-json"])
+    rows = json.loads(capsys.readouterr().out)
+
+    assert [row["gross_yen"] for row in rows] == [41000]
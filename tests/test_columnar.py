@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from lowest_price_buyer import columnar
+from lowest_price_buyer.columnar import OfferBatch
+from lowest_price_buyer.comparator import evaluate_offers
+from lowest_price_buyer.models import Offer
+from lowest_price_buyer.points import calculate_points
+
+
+def _offers(count):
+    rng = random.Random(3)
+    return [
+        Offer(
+            provider=rng.choice(["yahoo", "rakuten", "amazon", "manual"]),
+            title=f"Offer {index}",
+            price_yen=rng.randint(-100, 50000),
+            shipping_yen=rng.choice([0, 550]),
+            point_rate=rng.choice([None, 1, 2.5, 10.0, 33.3, -5.0]),
+            point_amount_yen=rng.choice([None, None, -10, 0, 120]),
+            url=rng.choice([None, f"https://example.com/{index}"]),
+        )
+        for index in range(count)
+    ]
+
+
+@pytest.fixture(params=["numpy", "python"])
+def backend(request, monkeypatch):
+    if request.param == "numpy":
+        if columnar._np is None:
+            pytest.skip("numpy is not installed")
+    else:
+        monkeypatch.setattr(columnar, "_np", None)
+    return request.param
+
+
+def test_offer_batch_matches_calculate_points(backend):
+    offers = _offers(3000)
+    evaluation = OfferBatch.from_offers(offers).evaluate()
+
+    for index, offer in enumerate(offers):
+        gross = max(offer.price_yen + offer.shipping_yen, 0)
+        points = calculate_points(offer)
+        assert evaluation.gross_yen[index] == gross
+        assert evaluation.points_yen[index] == points
+        assert evaluation.effective_yen[index] == max(gross - points, 0)
+
+
+def test_offer_batch_rank_matches_evaluate_offers(backend):
+    offers = _offers(3000)
+    batch = OfferBatch.from_offers(offers)
+
+    assert batch.rank() == evaluate_offers(offers)
+    assert batch.rank(limit=5) == evaluate_offers(offers)[:5]
+
+
+def test_offer_batch_round_trips_offers():
+    offers = _offers(50)
+    batch = OfferBatch.from_offers(offers)
+
+    assert len(batch) == 50
+    assert [batch.offer(index) for index in range(50)] == [
+        Offer(
+            provider=o.provider,
+            title=o.title,
+            price_yen=o.price_yen,
+            shipping_yen=o.shipping_yen,
+            point_rate=None if o.point_rate is None else float(o.point_rate),
+            point_amount_yen=o.point_amount_yen,
+            url=o.url,
+        )
+        for o in offers
+    ]
@@ -15,3 +15,45 @@ def test_evaluate_offers_sort_by_effective_price():
     assert ranked[0].effective_price_yen == 9000
     assert ranked[1].offer.provider == "b"  # 9800 - 100 = 9700
     assert ranked[2].offer.provider == "c"  # (9900+500) - 520 = 9880
+
+
+def test_top_k_ranker_matches_full_sort():
+    import random
+
+    from lowest_price_buyer.comparator import TopKRanker
+
+    rng = random.Random(7)
+    offers = [
+        Offer(
+            provider=rng.choice(["a", "b", "c"]),
+            title=str(index),
+            price_yen=rng.randint(900, 1100),
+            shipping_yen=rng.choice([0, 50]),
+            point_rate=rng.choice([None, 1.0, 5.0]),
+        )
+        for index in range(2000)
+    ]
+
+    ranker = TopKRanker(10)
+    ranker.extend(offers)
+
+    assert ranker.results() == evaluate_offers(offers)[:10]
+    assert evaluate_offers(offers, limit=10) == evaluate_offers(offers)[:10]
+    assert ranker.best() == evaluate_offers(offers)[0]
+    assert len(ranker) == 10
+    assert ranker.seen == 2000
+
+
+def test_top_k_ranker_reports_current_best_while_streaming():
+    from lowest_price_buyer.comparator import TopKRanker
+
+    ranker = TopKRanker(2)
+    assert ranker.best() is None
+
+    ranker.add(Offer(provider="a", title="A", price_yen=1000))
+    ranker.add(Offer(provider="b", title="B", price_yen=900))
+    assert ranker.best().offer.title == "B"
+
+    ranker.add(Offer(provider="c", title="C", price_yen=1200))
+    ranker.add(Offer(provider="d", title="D", price_yen=800))
+    assert [item.offer.title for item in ranker.results()] == ["D", "B"]
@@ -0,0 +1,73 @@
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from conftest import StubProvider
+from lowest_price_buyer.fanout import fetch_all
+
+
+def test_fetch_all_runs_providers_concurrently():
+    providers = [StubProvider(name, delay=0.2) for name in ("a", "b", "c", "d")]
+
+    started = time.monotonic()
+    result = fetch_all(providers, "switch")
+    elapsed = time.monotonic() - started
+
+    assert [offer.provider for offer in result.offers] == ["a", "b", "c", "d"]
+    assert elapsed < 0.6
+
+
+def test_fetch_all_returns_partial_results_at_deadline():
+    providers = [
+        StubProvider("fast"),
+        StubProvider("slow", delay=2.0),
+        StubProvider("broken", error="boom"),
+    ]
+
+    started = time.monotonic()
+    result = fetch_all(providers, "switch", provider_timeout=0.3, total_timeout=1.0)
+    elapsed = time.monotonic() - started
+
+    assert [offer.provider for offer in result.offers] == ["fast"]
+    assert result.timed_out == ["slow"]
+    assert result.errors == {"broken": "boom"}
+    assert elapsed < 1.0
+
+
+class TimeoutProbe(StubProvider):
+    def fetch_raw(self, keyword, max_results=5):
+        self.seen_timeout = self.request_timeout()
+        return super().fetch_raw(keyword, max_results)
+
+
+def test_provider_requests_use_the_remaining_budget():
+    provider = TimeoutProbe("probe")
+
+    fetch_all([provider], "switch", provider_timeout=5.0, total_timeout=0.5)
+
+    assert 0 < provider.seen_timeout <= 0.5
+
+
+def test_provider_clock_starts_when_its_task_starts():
+    providers = [StubProvider("a", delay=0.2), StubProvider("b", delay=0.2)]
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        result = fetch_all(providers, "switch", provider_timeout=0.3, executor=executor)
+
+    assert [offer.provider for offer in result.offers] == ["a", "b"]
+    assert result.timed_out == []
+
+
+def test_abandoned_providers_do_not_delay_exit():
+    code = (
+        "import sys; sys.path.insert(0, 'tests')\n"
+        "from conftest import StubProvider\n"
+        "from lowest_price_buyer.fanout import fetch_all\n"
+        "print(fetch_all([StubProvider('slow', delay=4.0)], 'x', total_timeout=0.2).timed_out)\n"
+    )
+    started = time.monotonic()
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+
+    assert completed.stdout.strip() == "['slow']"
+    assert time.monotonic() - started < 3.0
@@ -0,0 +1,59 @@
+from lowest_price_buyer.comparator import evaluate_offers
+from lowest_price_buyer.history import HistoryStore, parse_duration
+from lowest_price_buyer.models import Offer
+
+
+def _ranked(*prices):
+    return evaluate_offers(
+        [
+            Offer(provider="p", title=f"T{price}", price_yen=price, url=f"https://x/{price}")
+            for price in prices
+        ]
+    )
+
+
+def test_lowest_respects_keyword_and_time_window(tmp_path):
+    with HistoryStore(tmp_path / "history.db", batch_size=2) as store:
+        store.append("switch", _ranked(900, 1200), observed_at=100.0)
+        store.append("switch", _ranked(1000, 1100), observed_at=200.0)
+        store.append("lite", _ranked(500), observed_at=200.0)
+
+        assert [row["effective_yen"] for row in store.lowest("switch")] == [900]
+        assert [row["effective_yen"] for row in store.lowest("switch", since=150, limit=5)] == [
+            1000,
+            1100,
+        ]
+
+
+def test_trend_returns_url_history_in_time_order(tmp_path):
+    with HistoryStore(tmp_path / "history.db") as store:
+        store.append("switch", _ranked(1000), observed_at=300.0)
+        store.append("switch", _ranked(1000), observed_at=100.0)
+
+        rows = store.trend("https://x/1000")
+
+    assert [row["observed_at"] for row in rows] == [100.0, 300.0]
+
+
+def test_queries_use_indexes(tmp_path):
+    with HistoryStore(tmp_path / "history.db") as store:
+        conn = store._conn
+        lowest_plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM offers WHERE keyword = ? AND observed_at >= ? "
+            "ORDER BY effective_yen LIMIT 1",
+            ("switch", 0),
+        ).fetchall()
+        trend_plan = conn.execute(
+            "EXPLAIN QUERY PLAN SELECT * FROM offers WHERE url = ? ORDER BY observed_at",
+            ("https://x",),
+        ).fetchall()
+
+    assert "offers_keyword_price" in str(lowest_plan)
+    assert "offers_url_time" in str(trend_plan)
+
+
+def test_parse_duration():
+    assert parse_duration("90") == 90
+    assert parse_duration("30m") == 1800
+    assert parse_duration("1.5h") == 5400
+    assert parse_duration("7d") == 604800
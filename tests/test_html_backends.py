@@ -0,0 +1,110 @@
+import pytest
+
+from lowest_price_buyer.providers.amazon import parse_amazon_html
+from lowest_price_buyer.providers.soup import (
+    available_backends,
+    get_backend,
+    parse_stats,
+    reset_parse_stats,
+    set_backend,
+)
+from lowest_price_buyer.providers.yodobashi import parse_yodobashi_html
+
+
+AMAZON_HTML = """
+<html><body>
+<div class="s-result-item" data-component-type="s-search-result">
+  <h2><a href="/dp/B0001"><span>Nintendo Switch 本体</span></a></h2>
+  <span class="a-price"><span class="a-offscreen">￥32,978</span></span>
+  <span>330ポイント(1%)</span>
+</div>
+<div class="s-result-item" data-component-type="s-search-result">
+  <h2><span>No price item</span></h2>
+</div>
+<div class="s-result-item" data-component-type="s-search-result">
+  <h2><a href="https://www.amazon.co.jp/dp/B0002"><span>Switch Lite</span></a></h2>
+  <span class="a-price"><span class="a-offscreen">￥21,978</span></span>
+  <p>Free shipping
+</div>
+<div class="s-result-item" data-component-type="s-search-result">
+  <h2><span>Joy-Con &amp; strap</span></h2>
+  <span class="a-price"><span class="a-offscreen">￥8,000</span></span>
+</div>
+</body></html>
+"""
+
+YODOBASHI_HTML = """
+<html><body><ul>
+<li class="productListTile">
+  <a href="/product/100000001001/"><img src="a.jpg"></a>
+  <a href="/product/100000001001/">Nintendo Switch 本体 HAC-001</a>
+  <span>32,978円</span><span>3,298ポイント（10%還元）</span>
+</li>
+<li class="productListTile">
+  <a href="/product/100000001002/">Switch Lite</a>
+  <span>21,978円</span><span>10%還元</span>
+</li>
+<li class="productListTile">
+  <a href="/product/100000001003/">販売休止中</a>
+</li>
+<li class="productListTile">
+  <a href="https://www.yodobashi.com/product/100000001004/">Pro Controller</a>
+  <span>7,678円</span>
+</li>
+</ul></body></html>
+"""
+
+CASES = [
+    (parse_amazon_html, AMAZON_HTML),
+    (parse_yodobashi_html, YODOBASHI_HTML),
+]
+
+
+@pytest.fixture(autouse=True)
+def restore_backend():
+    yield
+    set_backend(None)
+
+
+@pytest.mark.parametrize("backend", available_backends())
+@pytest.mark.parametrize("parse, html", CASES)
+def test_backends_produce_identical_offers(backend, parse, html):
+    set_backend("html.parser")
+    expected = parse(html, max_results=10)
+
+    set_backend(backend)
+    assert parse(html, max_results=10) == expected
+
+
+def test_reference_backend_offers():
+    set_backend("html.parser")
+
+    amazon = parse_amazon_html(AMAZON_HTML, max_results=10)
+    yodobashi = parse_yodobashi_html(YODOBASHI_HTML, max_results=10)
+
+    assert [(o.title, o.price_yen, o.point_amount_yen) for o in amazon] == [
+        ("Nintendo Switch 本体", 32978, 330),
+        ("Switch Lite", 21978, None),
+        ("Joy-Con & strap", 8000, None),
+    ]
+    assert [(o.price_yen, o.point_amount_yen, o.point_rate) for o in yodobashi] == [
+        (32978, 3298, None),
+        (21978, None, 10.0),
+        (7678, None, None),
+    ]
+
+
+def test_set_backend_rejects_unknown_parser():
+    with pytest.raises(ValueError):
+        set_backend("html5lib-missing")
+    assert get_backend() in available_backends()
+
+
+def test_parse_time_is_recorded_per_page():
+    reset_parse_stats()
+    parse_amazon_html(AMAZON_HTML)
+    parse_amazon_html(AMAZON_HTML)
+
+    stats = parse_stats()
+    assert stats["amazon"]["pages"] == 2
+    assert stats["amazon"]["avg_ms"] > 0
@@ -0,0 +1,55 @@
+from lowest_price_buyer.comparator import evaluate_offers
+from lowest_price_buyer.matching import group_offers, model_numbers, normalize_title
+from lowest_price_buyer.models import Offer
+
+
+def test_normalize_title_folds_full_width_and_model_numbers():
+    title = normalize_title("【新品】Ｎｉｎｔｅｎｄｏ　Ｓｗｉｔｃｈ 本体 ＨＡＣ－００１")
+
+    assert title == "【新品】nintendo switch 本体 hac-001"
+    assert model_numbers(title) == {"HAC001"}
+    assert model_numbers(normalize_title("WH-1000XM5 ヘッドホン")) == {"WH1000XM5"}
+
+
+def test_group_offers_clusters_products_and_keeps_models_apart():
+    titles = [
+        ("yahoo", "Nintendo Switch 本体 HAC-001 ネオンブルー/ネオンレッド", 32000),
+        ("rakuten", "Ｎｉｎｔｅｎｄｏ Ｓｗｉｔｃｈ 本体 ＨＡＣ－００１ ネオンブルー／ネオンレッド", 31000),
+        ("amazon", "Nintendo Switch 本体 HAC001 ネオンブルー/ネオンレッド", 33000),
+        ("yodobashi", "Nintendo Switch 本体 HEG-001 ネオンブルー/ネオンレッド", 37000),
+        ("amazon", "Nintendo Switch 保護フィルム ブルーライトカット", 900),
+    ]
+    ranked = evaluate_offers([Offer(p, t, price) for p, t, price in titles])
+
+    groups = group_offers(ranked)
+
+    assert [len(group.offers) for group in groups] == [3, 1, 1]
+    assert groups[0].model_numbers == {"HAC001"}
+    assert groups[0].lowest.offer.provider == "rakuten"
+    assert [item.effective_price_yen for item in groups[0].offers] == [31000, 32000, 33000]
+    assert {group.model_numbers for group in groups[1:]} == {frozenset({"HEG001"}), frozenset()}
+
+
+def test_group_offers_merges_identical_titles_beyond_posting_cap():
+    ranked = evaluate_offers(
+        [Offer("rakuten", "ソニー WH-1000XM5 ブラック", 40000 + i) for i in range(50)]
+    )
+
+    groups = group_offers(ranked, max_postings=4)
+
+    assert len(groups) == 1
+    assert len(groups[0].offers) == 50
+
+
+def test_group_offers_does_not_bridge_models_through_unnumbered_titles():
+    titles = [
+        "Nintendo Switch 本体 HAC-001 ネオン",
+        "Nintendo Switch 本体 ネオン",
+        "Nintendo Switch 本体 HEG-001 ネオン",
+    ]
+    ranked = evaluate_offers([Offer("yahoo", title, 30000 + i) for i, title in enumerate(titles)])
+
+    groups = group_offers(ranked)
+
+    assert all(len(group.model_numbers) <= 1 for group in groups)
+    assert {model for group in groups for model in group.model_numbers} == {"HAC001", "HEG001"}
@@ -0,0 +1,43 @@
+import pytest
+
+from conftest import StubProvider
+from lowest_price_buyer.comparator import evaluate_offers
+from lowest_price_buyer.metrics import MetricsRegistry, registry
+from lowest_price_buyer.providers.base import ProviderError
+
+
+def test_registry_exports_histograms_as_json_and_prometheus():
+    metrics = MetricsRegistry()
+    metrics.observe("fetch_seconds", 0.003, provider="yahoo")
+    metrics.observe("fetch_seconds", 0.2, provider="yahoo")
+    metrics.inc("offers_total", 5, provider="yahoo")
+
+    (fetch,) = metrics.as_dict()["fetch_seconds"]
+    assert fetch["labels"] == {"provider": "yahoo"}
+    assert fetch["count"] == 2
+    assert fetch["buckets"]["0.001"] == 0
+    assert fetch["buckets"]["0.005"] == 1
+    assert fetch["buckets"]["+Inf"] == 2
+
+    text = metrics.to_prometheus()
+    assert "# TYPE lowest_price_buyer_fetch_seconds histogram" in text
+    assert 'lowest_price_buyer_fetch_seconds_bucket{provider="yahoo",le="0.25"} 2' in text
+    assert 'lowest_price_buyer_fetch_seconds_count{provider="yahoo"} 2' in text
+    assert 'lowest_price_buyer_offers_total{provider="yahoo"} 5' in text
+
+
+def test_provider_fetch_and_ranking_record_stage_metrics():
+    registry.reset()
+    offers = StubProvider("shop", offers=2).fetch("switch")
+    with pytest.raises(ProviderError):
+        StubProvider("shop", error="blocked").fetch("switch")
+    evaluate_offers(offers)
+
+    snapshot = registry.as_dict()
+    assert snapshot["fetch_seconds"][0]["count"] == 2
+    assert snapshot["download_seconds"][0]["count"] == 2
+    assert snapshot["parse_seconds"][0]["count"] == 1
+    assert snapshot["offers_total"][0]["value"] == 2
+    assert snapshot["fetch_errors_total"][0] == {"labels": {"provider": "shop"}, "value": 1}
+    assert snapshot["evaluated_offers_total"][0]["value"] == 2
+    registry.reset()
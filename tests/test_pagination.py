@@ -0,0 +1,107 @@
+import threading
+import time
+
+from lowest_price_buyer.providers import rakuten, yahoo
+from lowest_price_buyer.providers.base import collect_pages
+
+
+def test_collect_pages_fetches_remaining_pages_concurrently():
+    active = 0
+    peak = 0
+    lock = threading.Lock()
+    requested = []
+
+    def fetch_page(page):
+        nonlocal active, peak
+        with lock:
+            requested.append(page)
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.05)
+        with lock:
+            active -= 1
+        return [f"{page}-{i}" for i in range(10)], 50
+
+    items = collect_pages(
+        fetch_page, page_size=10, max_results=35, count_usable=len, max_pages=100
+    )
+
+    assert sorted(requested) == [1, 2, 3, 4]
+    assert peak == 3
+    assert items[:2] == ["1-0", "1-1"]
+    assert items[-1] == "4-9"
+
+
+def test_collect_pages_stops_when_first_page_is_enough():
+    requested = []
+
+    def fetch_page(page):
+        requested.append(page)
+        return ["a"] * 10, 5
+
+    collect_pages(fetch_page, page_size=10, max_results=10, count_usable=len, max_pages=5)
+
+    assert requested == [1]
+
+
+def test_collect_pages_sends_another_wave_for_unpriced_items():
+    requested = []
+
+    def fetch_page(page):
+        requested.append(page)
+        return [None if page == 2 else page] * 10, 5
+
+    items = collect_pages(
+        fetch_page,
+        page_size=10,
+        max_results=20,
+        count_usable=lambda items: sum(item is not None for item in items),
+        max_pages=5,
+    )
+
+    assert requested == [1, 2, 3]
+    assert len(items) == 30
+
+
+def test_rakuten_provider_pages_through_results(monkeypatch):
+    calls = []
+
+    def fake_fetch_json(url, params, timeout=20, session=None):
+        calls.append(params)
+        items = [
+            {"Item": {"itemName": f"P{params['page']}-{i}", "itemPrice": 100 + i}}
+            for i in range(params["hits"])
+        ]
+        return {"Items": items, "count": 90, "pageCount": 3}
+
+    monkeypatch.setattr(rakuten, "fetch_json", fake_fetch_json)
+    provider = rakuten.RakutenProvider(app_id="x")
+
+    offers = provider.fetch("switch", max_results=75)
+
+    assert sorted(call["page"] for call in calls) == [1, 2, 3]
+    assert {call["hits"] for call in calls} == {30}
+    assert len(offers) == 75
+    assert offers[0].title == "P1-0"
+    assert offers[30].title == "P2-0"
+
+
+def test_yahoo_provider_pages_with_start_offsets(monkeypatch):
+    calls = []
+
+    def fake_fetch_json(url, params, timeout=20, session=None):
+        calls.append(params)
+        hits = [
+            {"name": f"Y{params['start'] + i}", "price": 1000}
+            for i in range(params["results"])
+        ]
+        return {"hits": hits, "totalResultsAvailable": 250}
+
+    monkeypatch.setattr(yahoo, "fetch_json", fake_fetch_json)
+    provider = yahoo.YahooShoppingProvider(app_id="x")
+
+    offers = provider.fetch("switch", max_results=300)
+
+    assert sorted(call["start"] for call in calls) == [1, 101, 201]
+    assert len(offers) == 300
+    assert offers[100].title == "Y101"
@@ -27,6 +27,7 @@ def test_parse_rakuten_response_extracts_items():
                     "itemPrice": 5000,
                     "pointRate": 5,
                     "itemUrl": "https://example.com/item",
+                    "shopCode": "example-shop",
                 }
             }
         ]
@@ -37,3 +38,52 @@ def test_parse_rakuten_response_extracts_items():
     assert offers[0].provider == "rakuten"
     assert offers[0].price_yen == 5000
     assert offers[0].point_rate == 5.0
+    assert offers[0].store == "example-shop"
+
+
+def _yodobashi_cards(count):
+    cards = []
+    for index in range(count):
+        href = f"/product/{100000000000 + index}/"
+        cards.append(
+            "<div class='productListTile'>"
+            f"<a href='{href}'><img src='{index}.jpg'></a>"
+            f"<a href='{href}'>Product {index}</a>"
+            f"<a href='{href}'>Details</a>"
+            f"<span>{1000 + index:,}円</span><span>{index}ポイント</span>"
+            "</div>"
+        )
+    return "<html><body>" + "".join(cards) + "</body></html>"
+
+
+def test_parse_yodobashi_html_scans_each_card_once(monkeypatch):
+    from lowest_price_buyer.providers import yodobashi
+
+    calls = []
+    original = yodobashi._scan_card
+    monkeypatch.setattr(
+        yodobashi, "_scan_card", lambda container: calls.append(1) or original(container)
+    )
+
+    offers = yodobashi.parse_yodobashi_html(_yodobashi_cards(500), max_results=1000)
+
+    assert len(calls) == 500
+    assert len(offers) == 500
+    assert offers[499].title == "Product 499"
+    assert offers[499].price_yen == 1499
+    assert offers[499].point_amount_yen == 499
+
+
+def test_parse_yodobashi_html_stops_after_max_results(monkeypatch):
+    from lowest_price_buyer.providers import yodobashi
+
+    calls = []
+    original = yodobashi._scan_card
+    monkeypatch.setattr(
+        yodobashi, "_scan_card", lambda container: calls.append(1) or original(container)
+    )
+
+    offers = yodobashi.parse_yodobashi_html(_yodobashi_cards(500), max_results=5)
+
+    assert [offer.title for offer in offers] == [f"Product {i}" for i in range(5)]
+    assert len(calls) == 5
@@ -0,0 +1,46 @@
+import pstats
+
+from lowest_price_buyer import profiling
+from lowest_price_buyer.fanout import fetch_all
+from lowest_price_buyer.models import Offer
+from lowest_price_buyer.providers.base import BaseProvider
+
+
+class SlowParseProvider(BaseProvider):
+    def __init__(self, name):
+        super().__init__()
+        self.name = name
+
+    def fetch_raw(self, keyword, max_results=5):
+        return keyword
+
+    def parse(self, raw, max_results=5):
+        return [Offer(provider=self.name, title=_tokenize(raw), price_yen=1000)]
+
+
+def _tokenize(text):
+    return " ".join(sorted(text * 200))
+
+
+def test_stage_is_a_no_op_without_an_active_profiler():
+    assert profiling.stop() is None
+    with profiling.stage("evaluate"):
+        pass
+
+
+def test_profiler_writes_one_pstats_file_per_stage_and_provider(tmp_path):
+    profiler = profiling.start(tmp_path)
+    try:
+        fetch_all([SlowParseProvider("a"), SlowParseProvider("b")], "switch")
+    finally:
+        assert profiling.stop() is profiler
+
+    summaries = {summary.name: summary for summary in profiler.write(top=3)}
+
+    assert set(summaries) == {"fetch.a", "fetch.b", "parse.a", "parse.b"}
+    parse_a = summaries["parse.a"]
+    assert parse_a.path == tmp_path / "parse.a.pstats"
+    assert parse_a.runs == 1
+    assert len(parse_a.hot) == 3
+    functions = {name for _, _, name in pstats.Stats(str(parse_a.path)).stats}
+    assert "_tokenize" in functions
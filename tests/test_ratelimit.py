@@ -0,0 +1,119 @@
+import time
+
+import pytest
+
+from lowest_price_buyer.providers.deadline import DeadlineExceeded, deadline
+from lowest_price_buyer.providers.ratelimit import (
+    RateLimiter,
+    TokenBucket,
+    parse_rate_spec,
+    retry_after_seconds,
+)
+
+
+class FakeResponse:
+    def __init__(self, status_code, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self, statuses):
+        self.responses = [FakeResponse(status, headers) for status, headers in statuses]
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        response = self.responses[self.calls]
+        self.calls += 1
+        return response
+
+
+def test_limiter_does_not_retry_past_the_deadline():
+    session = FakeSession([(503, {"Retry-After": "5"}), (200, {})])
+    limiter = RateLimiter(max_retries=3)
+
+    started = time.monotonic()
+    with deadline(started + 0.5):
+        response = limiter.wrap(session).get("https://example.com", timeout=20)
+
+    assert response.status_code == 503
+    assert session.calls == 1
+    assert time.monotonic() - started < 0.5
+
+
+def test_token_wait_stops_at_the_deadline_without_taking_a_token():
+    limiter = RateLimiter(rate=0.5)
+    bucket = limiter.bucket
+    bucket.acquire()
+
+    started = time.monotonic()
+    with deadline(started + 0.2), pytest.raises(DeadlineExceeded):
+        limiter.wrap(FakeSession([(200, {})])).get("https://example.com")
+
+    assert time.monotonic() - started < 0.2
+    assert bucket._tokens < 1.0
+    assert limiter.stats.requests == 0
+
+
+def test_token_bucket_enforces_rate_after_burst():
+    bucket = TokenBucket(rate=20, burst=2)
+
+    started = time.monotonic()
+    for _ in range(4):
+        bucket.acquire()
+    elapsed = time.monotonic() - started
+
+    assert 0.08 <= elapsed < 0.5
+
+
+def test_limiter_retries_throttled_requests_honouring_retry_after():
+    session = FakeSession([(429, {"Retry-After": "0.05"}), (503, {}), (200, {})])
+    limiter = RateLimiter(max_retries=3, backoff=0.01)
+
+    started = time.monotonic()
+    response = limiter.wrap(session).get("https://example.com")
+
+    assert response.status_code == 200
+    assert time.monotonic() - started >= 0.05
+    assert session.responses[0].closed
+    assert limiter.stats.as_dict() == {
+        "requests": 3,
+        "throttled": 2,
+        "retried": 2,
+        "waited_seconds": 0.0,
+    }
+
+
+def test_limiter_returns_last_throttled_response_when_retries_run_out():
+    session = FakeSession([(429, {"Retry-After": "0"}), (429, {"Retry-After": "0"})])
+    limiter = RateLimiter(rate=100, burst=5, max_retries=1)
+
+    response = limiter.wrap(session).get("https://example.com")
+
+    assert response.status_code == 429
+    assert limiter.stats.throttled == 2
+    assert limiter.stats.retried == 1
+    assert limiter.bucket.rate < 100
+
+
+def test_retry_after_parses_seconds_and_http_dates():
+    assert retry_after_seconds("7") == 7.0
+    assert retry_after_seconds("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert retry_after_seconds("soon") is None
+    assert retry_after_seconds(None) is None
+
+
+def test_parse_rate_spec():
+    assert parse_rate_spec("yahoo=1, rakuten=0.5:3") == {
+        "yahoo": (1.0, 1.0),
+        "rakuten": (0.5, 3.0),
+    }
+    with pytest.raises(ValueError):
+        parse_rate_spec("yahoo")
+    for spec in ("amazon=-1", "amazon=0", "amazon=1:0", "amazon=fast"):
+        with pytest.raises(ValueError):
+            parse_rate_spec(spec)
@@ -0,0 +1,88 @@
+import gzip
+import json
+
+import pytest
+import requests
+
+from lowest_price_buyer.providers.amazon import AmazonProvider
+from lowest_price_buyer.providers.base import ProviderError
+from lowest_price_buyer.providers.replay import (
+    RecordingSession,
+    ReplaySession,
+    ResponseArchive,
+    parse_latency,
+)
+from lowest_price_buyer.providers.yahoo import YahooShoppingProvider
+
+AMAZON_HTML = """
+<div class='s-result-item' data-component-type='s-search-result'>
+  <h2><a href='/dp/B0001'><span>Sample Product</span></a></h2>
+  <span class='a-price'><span class='a-offscreen'>￥12,800</span></span>
+  <span>128ポイント(1%)</span>
+</div>
+"""
+
+
+class OriginSession:
+    """Stands in for the marketplaces while recording."""
+
+    def __init__(self):
+        self.requests = 0
+
+    def get(self, url, params=None, **kwargs):
+        self.requests += 1
+        response = requests.Response()
+        response.status_code = 200
+        response.encoding = "utf-8"
+        if "yahoo" in url:
+            body = {"totalResultsAvailable": 1, "hits": [{"name": "Switch", "price": 30000}]}
+            response._content = json.dumps(body).encode("utf-8")
+            response.headers["Content-Type"] = "application/json"
+        else:
+            response._content = AMAZON_HTML.encode("utf-8")
+            response.headers["Content-Encoding"] = "gzip"
+        return response
+
+
+@pytest.fixture
+def archive(tmp_path):
+    archive = ResponseArchive(tmp_path / "responses.ndjson.gz")
+    recorder = RecordingSession(OriginSession(), archive)
+    YahooShoppingProvider(app_id="secret-app-id", session=recorder).fetch("switch")
+    AmazonProvider(session=recorder).fetch("switch")
+    assert recorder.stats() == {"recorded": 2}
+    return archive
+
+
+def test_recorded_archive_omits_credentials_and_encoding_headers(archive):
+    with gzip.open(archive.path, "rt", encoding="utf-8") as stream:
+        text = stream.read()
+
+    assert "secret-app-id" not in text
+    assert "Content-Encoding" not in text
+
+
+def test_replay_serves_recorded_json_and_streamed_html(archive):
+    replay = ReplaySession(archive)
+
+    yahoo = YahooShoppingProvider(app_id="other-id", session=replay).fetch("switch")
+    amazon = AmazonProvider(session=replay).fetch("switch")
+
+    assert [(o.title, o.price_yen) for o in yahoo] == [("Switch", 30000)]
+    assert [(o.title, o.price_yen) for o in amazon] == [("Sample Product", 12800)]
+    with pytest.raises(ProviderError, match="no recorded response"):
+        AmazonProvider(session=replay).fetch("ps5")
+    assert replay.stats() == {"served": 2, "missed": 1, "injected_errors": 0}
+
+
+def test_replay_injects_errors_and_latency(archive):
+    replay = ReplaySession(archive, latency=(0.01, 0.01), error_rate=1.0, seed=1)
+
+    with pytest.raises(requests.HTTPError):
+        YahooShoppingProvider(app_id="x", session=replay).fetch("switch")
+    assert replay.stats()["injected_errors"] == 1
+    assert parse_latency("0.05:0.3") == (0.05, 0.3)
+    assert parse_latency("0.2") == (0.2, 0.2)
+    assert parse_latency("recorded") is None
+    with pytest.raises(ValueError):
+        parse_latency("0.3:0.1")
@@ -0,0 +1,72 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+
+import pytest
+
+from lowest_price_buyer.server import SearchServer, parse_address
+
+
+@pytest.fixture
+def server():
+    calls = []
+
+    def search(keyword, params):
+        calls.append((keyword, params))
+        return {"keyword": keyword, "offers": [{"provider": "a", "effective_yen": 100}]}
+
+    server = SearchServer(("127.0.0.1", 0), search, quiet=True)
+    server.calls = calls
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def _get(server, path):
+    host, port = server.server_address[:2]
+    with urllib.request.urlopen(f"http://{host}:{port}{path}") as response:
+        return json.loads(response.read().decode("utf-8"))
+
+
+def test_search_endpoint_returns_ranking_with_latency(server):
+    body = _get(server, "/search?keyword=Nintendo%20Switch&top=3")
+
+    assert body["keyword"] == "Nintendo Switch"
+    assert body["offers"][0]["effective_yen"] == 100
+    assert body["latency_ms"] >= 0
+    assert server.calls == [("Nintendo Switch", {"top": "3"})]
+    assert _get(server, "/stats")["latency"]["requests"] == 1
+
+
+def test_metrics_endpoint_serves_prometheus_text(server):
+    _get(server, "/search?keyword=switch")
+    host, port = server.server_address[:2]
+    with urllib.request.urlopen(f"http://{host}:{port}/metrics") as response:
+        content_type = response.headers["Content-Type"]
+        text = response.read().decode("utf-8")
+
+    assert content_type.startswith("text/plain")
+    assert "lowest_price_buyer_request_seconds_count" in text
+
+
+def test_search_endpoint_requires_keyword(server):
+    with pytest.raises(urllib.error.HTTPError) as excinfo:
+        _get(server, "/search")
+    assert excinfo.value.code == 400
+
+
+def test_parse_address():
+    assert parse_address("8080") == ("127.0.0.1", 8080)
+    assert parse_address("0.0.0.0:9000") == ("0.0.0.0", 9000)
+
+
+def test_request_overrides_bound_max_results():
+    from lowest_price_buyer.cli import _request_overrides
+
+    assert _request_overrides({"max_results": "20", "top": "3"}, 50) == {"max_results": 20, "top": 3}
+    for params in ({"max_results": "0"}, {"max_results": "100000"}, {"top": "0"}, {"top": "x"}):
+        with pytest.raises(ValueError):
+            _request_overrides(params, 50)
@@ -0,0 +1,45 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from conftest import StubProvider
+from lowest_price_buyer.providers.base import ProviderError
+from lowest_price_buyer.singleflight import SingleFlight
+
+
+def test_concurrent_identical_fetches_share_one_request():
+    flight = SingleFlight()
+    provider = StubProvider("slow", delay=0.2, singleflight=flight)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        futures = [pool.submit(provider.fetch, "switch") for _ in range(6)]
+        futures.append(pool.submit(provider.fetch, "switch", max_results=10))
+        results = [future.result() for future in futures]
+
+    assert provider.calls == 2
+    assert all(result == results[0] for result in results)
+    assert results[0] is not results[1]
+    assert flight.stats() == {"executed": 2, "shared": 5}
+
+
+def test_single_flight_shares_errors_and_forgets_completed_calls():
+    flight = SingleFlight()
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.1)
+        raise ProviderError("down")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(flight.do, "key", failing)
+        started.wait()
+        follower = pool.submit(flight.do, "key", lambda: "unused")
+        with pytest.raises(ProviderError):
+            leader.result()
+        with pytest.raises(ProviderError):
+            follower.result()
+
+    assert flight.do("key", lambda: "fresh") == "fresh"
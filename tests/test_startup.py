@@ -0,0 +1,50 @@
+import json
+import subprocess
+import sys
+
+from lowest_price_buyer.cache import ResponseCache
+
+HEAVY = ("requests", "urllib3", "bs4", "soupsieve", "lxml", "numpy")
+
+RUNNER = """
+import json, sys
+from lowest_price_buyer.cli import main
+try:
+    main(sys.argv[1:])
+except SystemExit:
+    pass
+print(json.dumps(sorted({name.split(".")[0] for name in sys.modules} & set(%r))))
+""" % (HEAVY,)
+
+
+def _heavy_modules_after(*argv):
+    completed = subprocess.run(
+        [sys.executable, "-c", RUNNER, *argv], capture_output=True, text=True, check=True
+    )
+    return json.loads(completed.stdout.splitlines()[-1])
+
+
+def test_package_import_is_lazy():
+    code = (
+        "import sys, lowest_price_buyer; "
+        "print('lowest_price_buyer.comparator' in sys.modules); "
+        "lowest_price_buyer.evaluate_offers; "
+        "print('lowest_price_buyer.comparator' in sys.modules)"
+    )
+    completed = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True)
+
+    assert completed.stdout.split() == ["False", "True"]
+
+
+def test_help_and_cache_hit_runs_skip_network_and_html_dependencies(tmp_path):
+    payload = {
+        "totalResultsAvailable": 1,
+        "hits": [{"name": "Switch", "price": 30000, "url": "https://example.com/1"}],
+    }
+    ResponseCache(tmp_path).put("yahoo", "switch", 5, payload)
+
+    cached_search = ["switch", "--providers", "yahoo", "--yahoo-app-id", "x"]
+    cached_search += ["--cache-dir", str(tmp_path), "--as-json"]
+
+    assert _heavy_modules_after("--help") == []
+    assert _heavy_modules_after(*cached_search) == []
@@ -0,0 +1,108 @@
+import pytest
+
+from lowest_price_buyer.metrics import registry
+from lowest_price_buyer.providers.amazon import AmazonProvider, parse_amazon_html
+from lowest_price_buyer.providers.yodobashi import YodobashiProvider, parse_yodobashi_html
+
+
+def _amazon_page(cards):
+    return "<html><body>\n" + "\n".join(
+        "<div class='s-result-item' data-component-type='s-search-result'>"
+        f"<h2><a href='/dp/B{index:04d}'><span>Item {index}</span></a></h2>"
+        + (
+            ""
+            if index % 4 == 1
+            else f"<span class='a-price'><span class='a-offscreen'>￥{1000 + index:,}</span></span>"
+        )
+        + f"<span>{index}ポイント</span></div>"
+        for index in range(cards)
+    ) + "\n</body></html>"
+
+
+def _yodobashi_page(cards):
+    return "<html><body><ul>" + "".join(
+        "<li>"
+        f"<a href='/product/{index}/'><img src='x.jpg'></a>"
+        f"<a href='/product/{index}/'>Item {index}</a>"
+        f"<span>{1000 + index:,}円</span><span>5%還元</span>"
+        "</li>"
+        for index in range(cards)
+    ) + "</ul></body></html>"
+
+
+class FakeResponse:
+    def __init__(self, html, chunk_size=256):
+        self.chunks = [html[i : i + chunk_size] for i in range(0, len(html), chunk_size)]
+        self.encoding = None
+        self.read = 0
+        self.closed = False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size=1, decode_unicode=False):
+        for chunk in self.chunks:
+            self.read += 1
+            yield chunk.encode("utf-8")
+
+    def close(self):
+        self.closed = True
+
+
+class FakeSession:
+    def __init__(self, response):
+        self.response = response
+        self.kwargs = None
+
+    def get(self, url, **kwargs):
+        self.kwargs = kwargs
+        return self.response
+
+
+@pytest.mark.parametrize(
+    "provider_class, parse, page",
+    [
+        (AmazonProvider, parse_amazon_html, _amazon_page(200)),
+        (YodobashiProvider, parse_yodobashi_html, _yodobashi_page(200)),
+    ],
+)
+def test_streamed_fetch_stops_early_with_identical_offers(provider_class, parse, page):
+    response = FakeResponse(page)
+    provider = provider_class(session=FakeSession(response))
+    parsed = []
+    parse_prefix = provider.parse
+    provider.parse = lambda raw, max_results=5: parsed.append(raw) or parse_prefix(raw, max_results)
+
+    offers = provider.fetch("switch", max_results=5)
+
+    assert offers == parse(page, max_results=5)
+    # The prefix that proved enough offers exist is not parsed a second time.
+    assert len(parsed) == len(set(parsed))
+    assert provider.session.kwargs["stream"] is True
+    assert response.closed
+    assert response.read < len(response.chunks) / 4
+
+
+def test_streamed_fetch_reads_whole_page_when_results_are_short():
+    page = _amazon_page(6)
+    response = FakeResponse(page, chunk_size=64)
+    provider = AmazonProvider(session=FakeSession(response))
+
+    offers = provider.fetch("switch", max_results=10)
+
+    assert offers == parse_amazon_html(page, max_results=10)
+    assert response.read == len(response.chunks)
+    assert response.closed
+
+
+def test_streamed_fetch_counts_received_bytes():
+    page = _yodobashi_page(200).replace("Item", "商品")
+    response = FakeResponse(page)
+    registry.reset()
+
+    YodobashiProvider(session=FakeSession(response)).fetch("switch", max_results=5)
+
+    received = sum(len(chunk.encode("utf-8")) for chunk in response.chunks[: response.read])
+    (counter,) = registry.as_dict()["payload_bytes_total"]
+    assert counter["value"] == received
+    registry.reset()
@@ -0,0 +1,57 @@
+import requests
+
+from lowest_price_buyer.providers.amazon import AmazonProvider
+from lowest_price_buyer.providers.rakuten import RakutenProvider
+from lowest_price_buyer.providers.transport import ConditionalSession, build_session, get_session
+
+
+def test_build_session_mounts_pooled_keep_alive_adapter():
+    session = build_session(pool_connections=4, pool_maxsize=32)
+
+    adapter = session.get_adapter("https://www.amazon.co.jp/s")
+    assert adapter._pool_connections == 4
+    assert adapter._pool_maxsize == 32
+    assert session.headers["Connection"] == "keep-alive"
+    assert "gzip" in session.headers["Accept-Encoding"]
+
+
+def test_providers_share_injected_or_default_session():
+    session = build_session()
+
+    assert AmazonProvider(session=session).session is session
+    assert RakutenProvider(app_id="x", session=session).session is session
+    assert AmazonProvider().session is get_session()
+    assert RakutenProvider(app_id="x").session is get_session()
+
+
+class _EtagSession:
+    def __init__(self):
+        self.sent_headers = []
+
+    def get(self, url, params=None, headers=None, **kwargs):
+        self.sent_headers.append(dict(headers or {}))
+        response = requests.Response()
+        if (headers or {}).get("If-None-Match") == '"v1"':
+            response.status_code = 304
+            response._content = b""
+        else:
+            response.status_code = 200
+            response._content = b'{"hits": []}'
+            response.headers["ETag"] = '"v1"'
+        return response
+
+
+def test_conditional_session_replays_body_on_not_modified():
+    inner = _EtagSession()
+    session = ConditionalSession(inner)
+
+    first = session.get("https://api.example/search", params={"query": "switch"})
+    second = session.get("https://api.example/search", params={"query": "switch"})
+    other = session.get("https://api.example/search", params={"query": "ps5"})
+
+    assert first.json() == second.json() == {"hits": []}
+    assert second.status_code == 200
+    assert inner.sent_headers[1] == {"If-None-Match": '"v1"'}
+    assert "If-None-Match" not in inner.sent_headers[2]
+    assert other.status_code == 200
+    assert session.stats() == {"revalidated": 1, "not_modified": 1}
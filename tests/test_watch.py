@@ -0,0 +1,121 @@
+import threading
+import time
+
+from lowest_price_buyer.watch import diff_rankings, watch
+
+
+def _row(provider, url, effective, gross=None):
+    return {
+        "provider": provider,
+        "title": url,
+        "gross_yen": gross if gross is not None else effective,
+        "points_yen": 0,
+        "effective_yen": effective,
+        "url": url,
+    }
+
+
+def test_diff_rankings_reports_added_removed_changed_and_new_lowest():
+    previous = [_row("rakuten", "a", 1000), _row("yahoo", "b", 1200)]
+    current = [_row("amazon", "c", 900), _row("rakuten", "a", 1100)]
+
+    change = diff_rankings("switch", previous, current)
+
+    assert change["new_lowest"] is True
+    assert change["lowest"]["url"] == "c"
+    assert [row["url"] for row in change["added"]] == ["c"]
+    assert [row["url"] for row in change["removed"]] == ["b"]
+    assert change["changed"][0]["before"]["effective_yen"] == 1000
+    assert change["changed"][0]["after"]["effective_yen"] == 1100
+    assert diff_rankings("switch", current, list(current)) is None
+
+
+def test_watch_staggers_polls_and_emits_only_changes():
+    now = [0.0]
+    polled = []
+    prices = {"a": [1000, 1000], "b": [500, 400]}
+
+    def search(keyword):
+        polled.append(keyword)
+        return [_row("rakuten", keyword, prices[keyword].pop(0))], {}
+
+    slept = []
+
+    def sleep(seconds):
+        slept.append(seconds)
+        now[0] += seconds
+
+    emitted = []
+    watch(
+        ["a", "b"],
+        search,
+        emitted.append,
+        interval=10,
+        concurrency=1,
+        rounds=2,
+        clock=lambda: now[0],
+        sleep=sleep,
+    )
+
+    assert sorted(polled) == ["a", "a", "b", "b"]
+    assert slept == [5.0, 5.0, 5.0]
+    assert sorted((r["keyword"], r["lowest"]["effective_yen"]) for r in emitted) == [
+        ("a", 1000),
+        ("b", 400),
+        ("b", 500),
+    ]
+
+
+def test_watch_keeps_offers_of_failed_providers_and_reports_the_error():
+    responses = [
+        ([_row("amazon", "a", 900), _row("rakuten", "b", 1000)], {}),
+        ([_row("amazon", "a", 900)], {"rakuten": "timed out"}),
+        ([_row("amazon", "a", 900), _row("rakuten", "b", 1000)], {}),
+    ]
+    emitted = []
+
+    watch(["switch"], lambda keyword: responses.pop(0), emitted.append, 0, rounds=3)
+
+    assert len(emitted) == 2
+    assert emitted[0]["added"] and emitted[0]["new_lowest"]
+    assert emitted[1] == {"keyword": "switch", "errors": {"rakuten": "timed out"}}
+
+
+def test_watch_reports_unchanged_errors_once_and_keeps_the_top_offers():
+    responses = [
+        ([_row("amazon", "a", 900), _row("rakuten", "b", 1000)], {}),
+        ([_row("amazon", "c", 800), _row("amazon", "a", 900)], {"rakuten": "timed out"}),
+        ([_row("amazon", "c", 800), _row("amazon", "a", 900)], {"rakuten": "timed out"}),
+        ([_row("amazon", "c", 800), _row("amazon", "a", 900)], {"rakuten": "HTTP 503"}),
+    ]
+    emitted = []
+
+    watch(["switch"], lambda keyword: responses.pop(0), emitted.append, 0, rounds=4, limit=2)
+
+    errors = [record["errors"] for record in emitted if "errors" in record]
+    assert errors == [{"rakuten": "timed out"}, {"rakuten": "HTTP 503"}]
+    # The kept rakuten offer falls outside the top 2 once amazon lists a cheaper one.
+    changes = [record for record in emitted if "errors" not in record]
+    assert len(changes) == 2
+    assert [row["url"] for row in changes[1]["added"]] == ["c"]
+    assert [row["url"] for row in changes[1]["removed"]] == ["b"]
+
+
+def test_watch_does_not_overlap_polls_of_one_keyword():
+    running = []
+    overlaps = []
+    lock = threading.Lock()
+
+    def search(keyword):
+        with lock:
+            overlaps.append(keyword in running)
+            running.append(keyword)
+        time.sleep(0.02)
+        with lock:
+            running.remove(keyword)
+        return [], {}
+
+    watch(["a", "b"], search, lambda record: None, 0, concurrency=4, rounds=3)
+
+    assert len(overlaps) == 6
+    assert not any(overlaps)
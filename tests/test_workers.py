@@ -0,0 +1,60 @@
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from lowest_price_buyer.providers.amazon import AmazonProvider, parse_amazon_html
+from lowest_price_buyer.providers.base import ProviderError
+from lowest_price_buyer.providers.deadline import DeadlineExceeded, deadline
+from lowest_price_buyer.providers.workers import create_parse_pool, parse_in_pool
+from lowest_price_buyer.providers.yodobashi import YodobashiProvider, parse_yodobashi_html
+
+
+AMAZON_HTML = "".join(
+    f"""
+    <div class='s-result-item' data-component-type='s-search-result'>
+      <h2><a href='/dp/B000{i}'><span>Sample Product {i}</span></a></h2>
+      <span class='a-price'><span class='a-offscreen'>￥12,80{i}</span></span>
+      <span>128ポイント(1%)</span>
+    </div>
+    """
+    for i in range(3)
+)
+
+YODOBASHI_HTML = """
+<div class='productListTile'>
+  <a href='/product/100000001/'>Sample Yodobashi Product</a>
+  <span>9,800円</span><span>980ポイント</span>
+</div>
+"""
+
+
+@pytest.fixture(scope="module")
+def pool():
+    with create_parse_pool(1, backend="html.parser") as executor:
+        yield executor
+
+
+def test_scrapers_parse_in_worker_processes(pool):
+    amazon = AmazonProvider(parse_executor=pool)
+    yodobashi = YodobashiProvider(parse_executor=pool)
+
+    assert amazon.parse(AMAZON_HTML, max_results=2) == parse_amazon_html(AMAZON_HTML, 2)
+    assert yodobashi.parse(YODOBASHI_HTML) == parse_yodobashi_html(YODOBASHI_HTML)
+
+
+def test_worker_parse_errors_reach_the_provider(pool):
+    with pytest.raises(ProviderError):
+        AmazonProvider(parse_executor=pool).parse("<html></html>")
+
+
+def test_worker_parse_wait_stops_at_the_deadline():
+    def slow_parse(raw, max_results):
+        time.sleep(0.5)
+        return []
+
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        started = time.monotonic()
+        with deadline(started + 0.1), pytest.raises(DeadlineExceeded):
+            parse_in_pool(executor, slow_parse, "<html></html>", 5)
+        assert time.monotonic() - started < 0.4